@@ -12,6 +12,7 @@ from vistautils.io_utils import (
     CharSink,
     CharSource,
     file_lines_to_set,
+    is_empty_directory,
     read_doc_id_to_file_map,
     write_doc_id_to_file_map,
 )
@@ -175,3 +176,11 @@ def test_to_file_byte(tmp_path: Path) -> None:
     byte_sink = ByteSink.to_file(file_path)
     byte_sink.write("hello\n\nworld".encode("utf-8"))
     assert ByteSource.from_file(file_path).read().decode("utf-8") == "hello\n\nworld"
+
+
+def test_is_empty_directory(tmp_path: Path) -> None:
+    assert is_empty_directory(tmp_path)
+    (tmp_path / "a_file").touch()
+    assert not is_empty_directory(tmp_path)
+    assert not is_empty_directory(tmp_path / "a_file")
+    assert not is_empty_directory(tmp_path / "does_not_exist")
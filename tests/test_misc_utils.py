@@ -23,3 +23,20 @@ class TestMiscUtils(TestCase):
                 context_modules=["datetime"],
                 expected_type=str,
             )
+
+    def test_eval_in_context_of_modules_reuses_context(self):
+        for value in range(3):
+            self.assertEqual(
+                value + 1,
+                eval_in_context_of_modules(
+                    "x + 1", {"x": value}, context_modules=[], expected_type=int
+                ),
+            )
+
+    def test_eval_in_context_of_modules_leading_whitespace(self):
+        self.assertEqual(
+            2,
+            eval_in_context_of_modules(
+                " \t1 + 1", {}, context_modules=[], expected_type=int
+            ),
+        )
@@ -1,11 +1,16 @@
+import bz2
+import gzip
 import os
 import pickle
 import shutil
+import subprocess
+import sys
 import tempfile
 from enum import Enum
 from pathlib import Path
 from textwrap import dedent
 from unittest import TestCase
+from unittest.mock import patch
 
 from attr import attrib, attrs, validators
 
@@ -148,6 +153,50 @@ class TestParameters(TestCase):
         with self.assertRaises(ParameterError):
             params.optional_existing_file("a_directory")
 
+        # paths are made absolute without resolving links unless requested
+        linked_file = test_dir / "linked_file"
+        linked_file.symlink_to(existing_file_path)
+        params = Parameters.from_mapping({"linked_file": str(linked_file)})
+        self.assertEqual(linked_file, params.existing_file("linked_file"))
+        self.assertEqual(
+            existing_file_path.resolve(),
+            params.optional_existing_file("linked_file", resolve=True),
+        )
+
+        shutil.rmtree(test_dir)
+
+    def test_existing_files_and_directories(self):
+        test_dir = Path(tempfile.mkdtemp()).absolute()
+        file_paths = [test_dir / f"file_{i}" for i in range(3)]
+        for file_path in file_paths:
+            file_path.touch()
+
+        params = Parameters.from_mapping(
+            {
+                **{
+                    f"file_{i}": str(file_path)
+                    for (i, file_path) in enumerate(file_paths)
+                },
+                "a_directory": str(test_dir),
+                "missing_file": str(test_dir / "missing"),
+            }
+        )
+
+        self.assertEqual(
+            [Path(os.path.realpath(file_path)) for file_path in file_paths],
+            list(params.existing_files(["file_0", "file_1", "file_2"], max_workers=2)),
+        )
+        self.assertEqual(
+            (Path(os.path.realpath(test_dir)),),
+            tuple(params.existing_directories(["a_directory"])),
+        )
+        with self.assertRaises(ParameterError):
+            params.existing_files(["file_0", "missing_file"])
+        with self.assertRaises(ParameterError):
+            params.existing_files(["file_0", "a_directory"])
+        with self.assertRaises(ParameterError):
+            params.existing_directories(["a_directory", "file_0"])
+
         shutil.rmtree(test_dir)
 
     def test_optional_existing_directory(self):
@@ -271,6 +320,31 @@ class TestParameters(TestCase):
             os.path.realpath(params.optional_creatable_file("non_existing_file")),
         )
 
+    def test_creatable_file_after_directory_cleared(self):
+        test_dir = Path(tempfile.mkdtemp()).absolute()
+        output_dir = test_dir / "output" / "nested"
+        params = Parameters.from_mapping(
+            {
+                "output_dir": str(output_dir),
+                "log": str(output_dir / "output.log"),
+                "metrics": str(output_dir / "output.metrics"),
+            }
+        )
+
+        self.assertTrue(params.creatable_file("log").parent.is_dir())
+        (output_dir / "output.log").touch()
+        params.creatable_empty_directory("output_dir", delete=True)
+        self.assertTrue(params.creatable_file("metrics").parent.is_dir())
+
+        # directories deleted outside of Parameters are created again
+        shutil.rmtree(str(test_dir / "output"))
+        self.assertTrue(params.creatable_empty_directory("output_dir").is_dir())
+        shutil.rmtree(str(test_dir / "output"))
+        self.assertTrue(params.creatable_directory("output_dir").is_dir())
+        shutil.rmtree(str(test_dir / "output"))
+        self.assertTrue(params.creatable_file("log").parent.is_dir())
+        shutil.rmtree(str(test_dir))
+
     def test_string(self):
         params = Parameters.from_mapping({"hello": "world"})
         self.assertEqual("world", params.string("hello"))
@@ -315,6 +389,14 @@ class TestParameters(TestCase):
             ParameterError, "Invalid value for integer parameter"
         ):
             params.integer("not_appearing", default=2, valid_range=Range.closed(10, 20))
+        # booleans are ints to Python, but not to us
+        bool_params = Parameters.from_mapping({"test_bool": True})
+        with self.assertRaises(ParameterError):
+            bool_params.integer("test_bool")
+        with self.assertRaises(ParameterError):
+            bool_params.optional_integer("test_bool")
+        with self.assertRaises(ParameterError):
+            bool_params.optional_positive_integer("test_bool")
 
     MULTIPLE_INTERPOLATION_REFERENCE = """
             the_ultimate_fruit: "%apple%"
@@ -581,6 +663,17 @@ class TestParameters(TestCase):
             empty_params.optional_floating_point(  # pylint: disable=unexpected-keyword-arg
                 "foo", default=-1.5, valid_range=Range.closed(0.0, 10.0)
             )
+        # falsy defaults are still defaults
+        assert (  # pylint: disable=unexpected-keyword-arg
+            empty_params.optional_arbitrary_list("foo", default=[]) == []
+        )
+        assert (  # pylint: disable=unexpected-keyword-arg
+            empty_params.optional_floating_point("foo", default=0.0) == 0.0
+        )
+        with self.assertRaises(ParameterError):
+            empty_params.optional_positive_integer(  # pylint: disable=unexpected-keyword-arg
+                "foo", default=0
+            )
 
     def test_namespace_prefix(self):
         assert Parameters.from_mapping({"hello": {"world": {"foo": "bar"}}}).namespace(
@@ -591,6 +684,16 @@ class TestParameters(TestCase):
         assert Parameters.empty().namespace_or_empty("foo").namespace_or_empty(
             "bar"
         ).namespace_prefix == ("foo", "bar")
+        assert Parameters.empty(namespace_prefix=["foo", "bar"]) == Parameters(
+            {}, namespace_prefix=("foo", "bar")
+        )
+        assert Parameters.empty() == Parameters()
+        # default factories receive empty parameters namespaced under the requested name
+        assert Parameters.empty(namespace_prefix=("outer",)).object_from_parameters(
+            "inner",
+            expected_type=tuple,
+            default_factory=lambda params: params.namespace_prefix,
+        ) == ("outer", "inner")
 
     def test_pickled_object_from_file(self):
         temp_dir = Path(tempfile.mkdtemp()).absolute()
@@ -606,6 +709,23 @@ class TestParameters(TestCase):
         # noinspection PyTypeChecker
         self.assertEqual(obj, params.pickled_object_from_file("pickled_obj_file"))
 
+        # compressed pickles are detected and decompressed transparently
+        for (compressed_file_name, opener) in (
+            ("gzipped", gzip.open),
+            ("bzipped", bz2.open),
+        ):
+            compressed_pickle_file = temp_dir / compressed_file_name
+            with opener(compressed_pickle_file, "wb") as bf:
+                pickle.dump(obj, bf)
+            compressed_params = Parameters.from_mapping(
+                {"pickled_obj_file": str(compressed_pickle_file)}
+            )
+            # compressed pickles are streamed rather than decompressed into memory at once
+            with patch("vistautils.parameters.pickle.loads", side_effect=AssertionError):
+                self.assertEqual(
+                    obj, compressed_params.pickled_object_from_file("pickled_obj_file")
+                )
+
 
 def test_enum_members():
     class TestEnum(Enum):
@@ -699,6 +819,127 @@ def test_interpolating_nested_parameters(tmp_path):
     assert loaded_params.string("interpolate_me") == "lala meep lala"
 
 
+def test_reloading_with_same_loader(tmp_path):
+    included_params_path = tmp_path / "included.params"
+    included_params_path.write_text("greeting: hello\n", encoding="utf-8")
+    including_params_path = tmp_path / "including.params"
+    including_params_path.write_text(
+        '_includes:\n    - included.params\nmessage: "%greeting% world"\n',
+        encoding="utf-8",
+    )
+
+    loader = YAMLParametersLoader()
+    first_load = loader.load(including_params_path)
+    assert first_load.string("message") == "hello world"
+    # the include directive is not lost when the same file is loaded again
+    assert loader.load(including_params_path) == first_load
+
+    # files changed since they were last loaded are re-read
+    included_params_path.write_text("greeting: goodbye\n", encoding="utf-8")
+    assert loader.load(including_params_path).string("message") == "goodbye world"
+
+
+def test_include_cycle(tmp_path):
+    first_params_path = tmp_path / "first.params"
+    first_params_path.write_text("_includes:\n    - second.params\n", encoding="utf-8")
+    second_params_path = tmp_path / "second.params"
+    second_params_path.write_text("_includes:\n    - first.params\n", encoding="utf-8")
+
+    with pytest.raises(IOError) as error:
+        YAMLParametersLoader().load(first_params_path)
+    # the cycle is reported as the cause of the failure to load the included file
+    cause = error.value
+    while cause.__cause__ is not None:
+        cause = cause.__cause__
+    assert "Parameter files include each other" in str(cause)
+
+
+def test_reloading_does_not_share_mutable_values(tmp_path):
+    params_path = tmp_path / "list.params"
+    params_path.write_text(
+        "a: [1, 2]\nns:\n    b: [{c: 3}]\n    d: unchanged\n", encoding="utf-8"
+    )
+    loader = YAMLParametersLoader()
+    loaded = loader.load(params_path)
+    loaded.get("a", list).append(99)
+    loaded.get("ns.b", list)[0]["c"] = 4
+    # the second load reuses the first parse but not the values we changed
+    reloaded = loader.load(params_path)
+    assert reloaded.get("a", list) == [1, 2]
+    assert reloaded.get("ns.b", list) == [{"c": 3}]
+    assert reloaded.string("ns.d") == "unchanged"
+
+
+def test_load_cached(tmp_path):
+    included_params_path = tmp_path / "included.params"
+    included_params_path.write_text("greeting: hello\n", encoding="utf-8")
+    including_params_path = tmp_path / "including.params"
+    including_params_path.write_text(
+        '_includes:\n    - included.params\nmessage: "%greeting% world"\n',
+        encoding="utf-8",
+    )
+
+    loaded = YAMLParametersLoader().load_cached(including_params_path)
+    assert loaded == YAMLParametersLoader().load(including_params_path)
+    assert (tmp_path / "including.params.pcache").exists()
+    # a fresh loader can use the cache written by another
+    assert YAMLParametersLoader().load_cached(including_params_path) == loaded
+
+    # The cache holds only the parameters themselves, not anything cached on them
+    # (in particular not a hash computed in the process which wrote it).
+    # Checking this file for interpolation builds the index of its parameters.
+    percent_params_path = tmp_path / "percent.params"
+    percent_params_path.write_text('discount: "50%"\n', encoding="utf-8")
+    percent_params = YAMLParametersLoader().load_cached(percent_params_path)
+    hash(percent_params)
+    from_cache = YAMLParametersLoader().load_cached(percent_params_path)
+    # pylint: disable=protected-access
+    assert from_cache._flat_index_cache is None
+    assert from_cache._hash_cache is None
+    assert hash(from_cache) == hash(percent_params)
+    assert {percent_params: "found"}.get(from_cache) == "found"
+
+    # modifying an included file invalidates the cache
+    included_params_path.write_text("greeting: goodbye there\n", encoding="utf-8")
+    assert (
+        YAMLParametersLoader().load_cached(including_params_path).string("message")
+        == "goodbye there world"
+    )
+
+    # the cache may be kept elsewhere
+    cache_directory = tmp_path / "cache"
+    loaded = YAMLParametersLoader().load_cached(
+        including_params_path, cache_directory=cache_directory
+    )
+    assert loaded.string("message") == "goodbye there world"
+    assert len(list(cache_directory.glob("*.pcache"))) == 1
+    assert (
+        YAMLParametersLoader().load_cached(
+            including_params_path, cache_directory=cache_directory
+        )
+        == loaded
+    )
+
+
+def test_load_cached_file_modified_while_loading(tmp_path):
+    params_path = tmp_path / "modified.params"
+    params_path.write_text("greeting: hello\n", encoding="utf-8")
+    parse_file = YAMLParametersLoader._parse_file
+
+    def parse_then_modify(self, path, file_version):
+        ret = parse_file(self, path, file_version)
+        # a different size guarantees a different version, however coarse the mtime
+        path.write_text("greeting: goodbye\n", encoding="utf-8")
+        return ret
+
+    with patch.object(YAMLParametersLoader, "_parse_file", parse_then_modify):
+        assert (
+            YAMLParametersLoader().load_cached(params_path).string("greeting") == "hello"
+        )
+    # the cache records the version of the file which was read, so it is now stale
+    assert YAMLParametersLoader().load_cached(params_path).string("greeting") == "goodbye"
+
+
 def test_exception_when_interpolating_unknown_param(tmp_path) -> None:
     parameters = {"hello": "world", "interpolate_me": "%unknown_param%"}
     params_file = tmp_path / "tmp.params"
@@ -719,6 +960,166 @@ def test_namespaced_items():
     }
 
 
+def test_unify():
+    old = Parameters.from_mapping(
+        {"kept": 1, "overridden": 2, "ns": {"a": "old", "b": "old"}, "null_new": 3}
+    )
+    new = Parameters.from_mapping(
+        {"overridden": 20, "ns": {"b": "new", "c": "new"}, "added": 4, "null_new": None}
+    )
+    assert old.unify(new).as_nested_dicts() == {
+        "kept": 1,
+        "overridden": 20,
+        "ns": {"a": "old", "b": "new", "c": "new"},
+        # parameters with None values are treated as absent
+        "null_new": 3,
+        "added": 4,
+    }
+    assert old.unify(new).namespace("ns").namespace_prefix == ("ns",)
+
+    # unifying with an empty side gives the other side, with the requested prefix
+    assert Parameters.empty().unify(new) == new
+    assert old.unify(Parameters.empty()) == old
+    prefixed = Parameters.empty().unify(new, namespace_prefix=("x",))
+    assert prefixed.namespace_prefix == ("x",)
+
+    with pytest.raises(IOError):
+        old.unify({"ns": "not a namespace"})
+
+
+def test_dotted_lookups():
+    params = Parameters.from_mapping(
+        {"a": {"b": {"c": {"d": 1}, "leaf": "hello"}}, "top": False}
+    )
+    assert params.integer("a.b.c.d") == 1
+    assert params.namespace("a.b.c") == params.namespace("a").namespace("b.c")
+    assert params.namespace("a.b.c").namespace_prefix == ("a", "b", "c")
+    assert "a.b.leaf" in params
+    assert "a.b.leaf.deeper" not in params
+    assert "a.b.missing" not in params
+    assert not params.boolean("top")
+    with pytest.raises(ParameterError):
+        params.string("a.b.leaf.deeper")
+    with pytest.raises(ParameterError):
+        params.string("a.b.missing")
+    assert params.optional_string("a.b.missing") is None
+    assert params.optional_string("a.b.leaf.deeper") is None
+    assert params.string("a.b.missing", default="fallback") == "fallback"
+
+
+def test_data_is_read_only():
+    params = Parameters.from_mapping({"hello": "world", "foo": {"bar": "meep"}})
+    assert params.data["hello"] == "world"
+    with pytest.raises(TypeError):
+        params.data["hello"] = "moon"  # type: ignore
+
+    # modifying the nested dicts must not change the parameters they came from
+    nested_dicts = params.as_nested_dicts()
+    nested_dicts["foo"]["bar"] = "moo"
+    assert params.string("foo.bar") == "meep"
+    assert hash(params) == hash(
+        Parameters.from_mapping({"hello": "world", "foo": {"bar": "meep"}})
+    )
+
+
+def test_pickled_parameters_hash_across_processes(tmp_path: Path):
+    # string hashes differ between processes with different hash seeds,
+    # so a hash cached before pickling must not survive unpickling
+    pickle_file = tmp_path / "params.pickle"
+    make_params = (
+        "from vistautils.parameters import Parameters\n"
+        "params = Parameters.from_mapping({'hello': 'world', 'foo': {'bar': 'meep'}})\n"
+    )
+    dump_script = make_params + (
+        "import pickle, sys\n"
+        "hash(params)\n"
+        "hash(params.namespace('foo'))\n"
+        "params.string('foo.bar')\n"
+        "with open(sys.argv[1], 'wb') as out:\n"
+        "    pickle.dump(params, out)\n"
+    )
+    load_script = make_params + (
+        "import pickle, sys\n"
+        "with open(sys.argv[1], 'rb') as inp:\n"
+        "    unpickled = pickle.load(inp)\n"
+        "assert unpickled == params\n"
+        "assert hash(unpickled) == hash(params)\n"
+        "assert {params: 'found'}.get(unpickled) == 'found'\n"
+        "assert hash(unpickled.namespace('foo')) == hash(params.namespace('foo'))\n"
+        "assert unpickled.string('foo.bar') == 'meep'\n"
+    )
+    for (script, hash_seed) in ((dump_script, "1"), (load_script, "2")):
+        subprocess.run(
+            [sys.executable, "-c", script, str(pickle_file)],
+            check=True,
+            # so the subprocess imports the vistautils under test
+            cwd=Path(__file__).parent.parent,
+            env={**os.environ, "PYTHONHASHSEED": hash_seed},
+        )
+
+
+def test_unpickle_parameters_pickled_by_older_versions():
+    # Parameters.from_mapping({"hello": "world", "foo": {"bar": "meep"}}) pickled
+    # (with protocol 2) by a version of vistautils storing its data in an ImmutableDict
+    # and having no cache fields
+    old_pickle = (
+        b"\x80\x02cvistautils.parameters\nParameters\nq\x00)\x81q\x01"
+        b"cimmutablecollections._immutabledict\nimmutabledict\nq\x02"
+        b"X\x05\x00\x00\x00helloq\x03X\x05\x00\x00\x00worldq\x04\x86q\x05"
+        b"X\x03\x00\x00\x00fooq\x06h\x00)\x81q\x07h\x02"
+        b"X\x03\x00\x00\x00barq\x08X\x04\x00\x00\x00meepq\t\x86q\n\x85q\x0b"
+        b"\x85q\x0cRq\rh\x06\x85q\x0e\x86q\x0fb\x86q\x10\x86q\x11\x85q\x12"
+        b"Rq\x13)\x86q\x14b."
+    )
+    unpickled = pickle.loads(old_pickle)
+    params = Parameters.from_mapping({"hello": "world", "foo": {"bar": "meep"}})
+    assert unpickled == params
+    assert hash(unpickled) == hash(params)
+    assert unpickled.string("foo.bar") == "meep"
+    assert "hello" in unpickled
+    assert unpickled.namespace("foo").namespace_prefix == ("foo",)
+    with pytest.raises(ParameterError, match="In namespace foo"):
+        unpickled.namespace("foo").string("missing")
+
+
+def test_keys_cannot_contain_namespace_separator():
+    with pytest.raises(ValueError):
+        Parameters.from_mapping({"hello": "world", "foo.bar": "meep"})
+    with pytest.raises(ValueError):
+        Parameters.from_mapping({"hello": {"nested.key": 1}})
+
+
+def test_yaml_keys_must_be_strings():
+    with pytest.raises(IOError) as exception_info:
+        YAMLParametersLoader().load_string("outer:\n    inner:\n        1: one\n")
+    assert (
+        str(exception_info.value.__cause__)
+        == "Non-string key(s) [1] in context outer.inner"
+    )
+
+
+def test_writing_shared_values_to_yaml():
+    shared_list = [1, 2]
+    params = Parameters.from_mapping(
+        {"first": shared_list, "second": shared_list, "as_tuple": (Path("/meep"),)}
+    )
+    string_buffer = CharSink.to_string()
+    YAMLParametersWriter().write(params, string_buffer)
+    # values are written in full at each occurrence rather than as YAML aliases
+    assert string_buffer.last_string_written == dedent(
+        """\
+        first:
+        - 1
+        - 2
+        second:
+        - 1
+        - 2
+        as_tuple:
+        - /meep
+        """
+    )
+
+
 def test_relative_path_list(tmp_path):
     file_list = tmp_path / "list.txt"
     CharSink.to_file(file_list).write("\n".join(["fred/bob.txt", "foo.txt"]))
@@ -744,6 +1145,14 @@ def test_relative_path_map(tmp_path):
     ) == {"one": Path("/hello/world/fred/bob.txt"), "two": Path("/hello/world/foo.txt")}
 
 
+def test_path_map_rejects_extra_fields(tmp_path):
+    file_map = tmp_path / "map.txt"
+    CharSink.to_file(file_map).write("one\tfred/bob.txt\textra")
+    params = Parameters.from_mapping({"file_map": str(file_map)})
+    with pytest.raises(IOError):
+        params.path_map_from_file("file_map")
+
+
 # Used by test_environmental_variable_interpolation.
 # Here we test:
 # (a) one uninterpolated parameter
@@ -35,3 +35,28 @@ def test_parameters_only_entry_point(tmp_path: Path):
             "I've been overridden",
         ],
     )
+
+
+def test_parameters_only_entry_point_with_explicit_parameters():
+    _real_parameters_only_entry_point(
+        sample_main,
+        parameters=Parameters.from_mapping(
+            {
+                "only_original": "foo",
+                "overridden": "goodbye",
+                "nested": {"overridden": "no"},
+            }
+        ),
+        program_name="test",
+        args=[
+            "-p",
+            "only_cli",
+            "bar",
+            "-p",
+            "overridden",
+            "hello",
+            "-p",
+            "nested.overridden",
+            "I've been overridden",
+        ],
+    )
@@ -1,6 +1,11 @@
 from unittest import TestCase
 
-from vistautils.preconditions import check_arg, check_not_none
+from vistautils.preconditions import (
+    check_all_isinstance,
+    check_arg,
+    check_args_not_none,
+    check_not_none,
+)
 
 
 class TestPreconditions(TestCase):
@@ -21,3 +26,13 @@ class TestPreconditions(TestCase):
             check_not_none(None)
         with self.assertRaisesRegex(ValueError, "foo"):
             check_not_none(None, "foo")
+
+    def test_check_args_not_none(self):
+        check_args_not_none(1, "a", msg="foo")
+        with self.assertRaisesRegex(ValueError, "foo"):
+            check_args_not_none(1, None, msg="foo")
+
+    def test_check_all_isinstance(self):
+        check_all_isinstance([1, 2], int)
+        with self.assertRaisesRegex(TypeError, "Expected instance of type"):
+            check_all_isinstance([1, "2"], int)
@@ -36,8 +36,11 @@ def is_empty_directory(path: Path) -> bool:
     """
     Returns if path is a directory with no content.
     """
-    sentinel = object()
-    return path.is_dir() and next(path.iterdir().__iter__(), sentinel) == sentinel
+    if not path.is_dir():
+        return False
+    # scandir lets us stop after reading the first entry rather than listing the whole directory
+    with os.scandir(path) as entries:
+        return next(entries, None) is None
 
 
 class CharSource(metaclass=ABCMeta):
@@ -1,6 +1,8 @@
 import importlib
+from functools import lru_cache
 from itertools import chain
 from pathlib import Path
+from types import CodeType
 from typing import Any, Generic, Iterable, List, Mapping, Sequence, Type, TypeVar, Union
 
 from attr import attrib, attrs, validators
@@ -40,6 +42,14 @@ def str_list_limited(_list: Iterable[Any], limit: int) -> str:
 T = TypeVar("T")
 
 
+@lru_cache(maxsize=1024)
+def _compile_expression(to_eval: str) -> CodeType:
+    # compiling does not depend on the evaluation context, so the same expression string
+    # evaluated repeatedly (e.g. in a loop over Parameters.evaluate) is compiled only once.
+    # Like eval itself, we ignore leading spaces and tabs, which compile would reject.
+    return compile(to_eval.lstrip(" \t"), "<string>", "eval")
+
+
 def eval_in_context_of_modules(
     to_eval: str,
     context: Mapping[Any, Any],
@@ -71,7 +81,7 @@ def eval_in_context_of_modules(
             package_name = ".".join(package_parts[0 : package_part_idx + 1])
             if package_name not in context:
                 context[package_name] = importlib.import_module(package_name)
-    ret = eval(to_eval, context)  # pylint:disable=eval-used
+    ret = eval(_compile_expression(to_eval), context)  # pylint:disable=eval-used
     if isinstance(ret, expected_type):
         return ret
     else:
@@ -1,44 +1,55 @@
 # pylint: skip-file
+import bz2
+import gzip
+import hashlib
 import inspect
 import logging
 import os
 import pickle
 import re
 import shutil
-from datetime import date
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from datetime import date, datetime
 from enum import Enum, EnumMeta
+from functools import lru_cache
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
+from types import MappingProxyType
 from typing import (
     Any,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
-    Match,
     MutableMapping,
     Optional,
     Sequence,
+    Set,
+    TextIO,
     Tuple,
     Type,
     TypeVar,
     Union,
     overload,
 )
+from weakref import WeakKeyDictionary
 
-from attr import attrib, attrs
+from attr import Factory, attrib, attrs
 
 from immutablecollections import ImmutableDict, ImmutableSet, immutabledict, immutableset
 from immutablecollections.converter_utils import _to_tuple
 
 from vistautils._graph import Digraph
-from vistautils.io_utils import CharSink, is_empty_directory
+from vistautils.io_utils import CharSink
 from vistautils.misc_utils import eval_in_context_of_modules
 from vistautils.preconditions import check_arg, check_isinstance
 from vistautils.range import Range
 
 import deprecation
-import yaml
 
 _logger = logging.getLogger(__name__)  # pylint:disable=invalid-name
 
@@ -51,8 +62,147 @@ _ParamType = TypeVar("_ParamType")  # pylint:disable=invalid-name
 _U = TypeVar("_U")  # pylint:disable=invalid-name
 _EnumType = TypeVar("_EnumType", bound=Enum)
 
+_NAMESPACE_SEPARATOR_REGEX = re.compile(r"\.")
 
-@attrs(frozen=True, slots=True)
+
+def _to_tuple_fast(val: Iterable[str]) -> Tuple[str, ...]:
+    # namespace prefixes are almost always already tuples, so skip the general conversion
+    if type(val) is tuple:  # pylint:disable=unidiomatic-typecheck
+        return val  # type: ignore
+    return _to_tuple(val)
+
+
+# Uncompressed pickles no larger than this are read into memory in one go before unpickling.
+# Larger ones are streamed to avoid holding both the raw bytes and the object in memory.
+_MAX_PICKLE_BYTES_TO_READ_AT_ONCE = 256 * 1024 * 1024
+_GZIP_MAGIC_BYTES = b"\x1f\x8b"
+_BZIP2_MAGIC_BYTES = b"BZh"
+
+# The types of the immutable values the YAML loader can produce. Any other values
+# (e.g. lists) need copying before they are handed out from a cached parse.
+_IMMUTABLE_YAML_VALUE_TYPES = frozenset(
+    (str, int, float, bool, type(None), bytes, date, datetime)
+)
+
+# Marks missing values in lookups where None is a legitimate value.
+_SENTINEL = object()
+
+# Shared default for the special value and factory maps of evaluate and object_from_parameters.
+_EMPTY_MAPPING: Mapping[Any, Any] = immutabledict()
+
+# See YAMLParametersLoader.load_cached.
+_PARAMETERS_CACHE_SUFFIX = ".pcache"
+_PARAMETERS_CACHE_FORMAT_VERSION = 1
+
+
+def _environment_digest() -> str:
+    """
+    Get a digest of the current environmental variables, to tell whether they have changed.
+    """
+    return hashlib.sha256(repr(sorted(os.environ.items())).encode("utf-8")).hexdigest()
+
+
+# Directories which the creatable_* accessors have already ensured exist in this process.
+# This lets configurations which place many outputs in the same directory
+# avoid repeatedly asking the filesystem to create it
+# (we still check that it exists, in case it was deleted since).
+_CREATED_DIRS: Set[Path] = set()
+_CREATED_DIRS_LOCK = threading.Lock()
+
+
+def _absolute_path(path_string: str, *, resolve: bool = False) -> Path:
+    """
+    Get *path_string* as an absolute path.
+
+    Unless *resolve* is specified, this does not touch the filesystem, so symbolic links
+    and ``..`` components are kept as given.
+    """
+    if resolve:
+        return Path(path_string).resolve()
+    return Path(path_string).absolute()
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """
+    Get the status of *path*, or `None` if it does not exist.
+
+    One `stat` call tells us both whether a path exists and what kind of thing it is.
+    """
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _ensure_directory_exists(directory: Path) -> None:
+    with _CREATED_DIRS_LOCK:
+        already_created = directory in _CREATED_DIRS
+    # The directory may have been deleted since we created it, so we check it still exists.
+    # A single stat is still cheaper than mkdir, which may walk and create the parents.
+    if already_created and directory.is_dir():
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    with _CREATED_DIRS_LOCK:
+        _CREATED_DIRS.add(directory)
+
+
+def _forget_created_directories_under(directory: Path) -> None:
+    with _CREATED_DIRS_LOCK:
+        for created_dir in [
+            created_dir
+            for created_dir in _CREATED_DIRS
+            if created_dir == directory or directory in created_dir.parents
+        ]:
+            _CREATED_DIRS.discard(created_dir)
+
+
+class _FactoryKind(Enum):
+    """
+    How `Parameters.object_from_parameters` should apply a factory to a namespace.
+    """
+
+    # a class whose from_parameters method should be called with the namespace
+    FROM_PARAMETERS = 1
+    # a class whose constructor should be called without arguments
+    NO_ARGUMENT_CONSTRUCTOR = 2
+    # any other callable, which should be called with the namespace
+    CALLABLE = 3
+
+
+# Caches how each factory used with object_from_parameters should be applied,
+# since the introspection needed to determine this is comparatively slow.
+# The factories are weakly referenced so we don't keep dynamically created classes alive.
+_FACTORY_KINDS: "WeakKeyDictionary[Any, _FactoryKind]" = WeakKeyDictionary()
+
+
+def _factory_kind(factory: Any) -> _FactoryKind:
+    try:
+        return _FACTORY_KINDS[factory]
+    except (KeyError, TypeError):
+        # TypeError occurs for factories which can't be weakly referenced or hashed.
+        pass
+
+    if inspect.isclass(factory):
+        if hasattr(factory, "from_parameters"):
+            kind = _FactoryKind.FROM_PARAMETERS
+        else:
+            kind = _FactoryKind.NO_ARGUMENT_CONSTRUCTOR
+    elif callable(factory):
+        kind = _FactoryKind.CALLABLE
+    else:
+        raise ParameterError(
+            f"Expected a class with from_parameters or a callable but got {factory}"
+        )
+
+    try:
+        _FACTORY_KINDS[factory] = kind
+    except TypeError:
+        # some factories, such as built-in functions, cannot be weakly referenced
+        pass
+    return kind
+
+
+@attrs(frozen=True, slots=True, hash=False)
 class Parameters:
     """
     Configuration parameters for a program.
@@ -73,27 +223,88 @@ class Parameters:
     You can check if a lookup of a parameter would be successful using the `in` operator.
     """
 
-    _data: ImmutableDict[str, Any] = attrib(
-        default=immutabledict(), converter=immutabledict
-    )
+    # This is a plain dict rather than an ImmutableDict so lookups use the native dict methods.
+    # It is copied on construction and never mutated afterwards.
+    _data: Dict[str, Any] = attrib(default=Factory(dict), converter=dict)
     namespace_prefix: Tuple[str, ...] = attrib(
-        default=tuple(), converter=_to_tuple, kw_only=True
+        default=tuple(), converter=_to_tuple_fast, kw_only=True
+    )
+    # Maps every dotted parameter name relative to this Parameters to its value.
+    # This is built lazily on the first dotted lookup; see _flat_index.
+    _flat_index_cache: Optional[Dict[str, Any]] = attrib(
+        init=False, default=None, eq=False, repr=False
     )
+    # The prefix for error messages about this namespace; see _namespace_message.
+    _namespace_message_cache: Optional[str] = attrib(
+        init=False, default=None, eq=False, repr=False
+    )
+    # Parameters are immutable, so their hash is computed at most once; see __hash__.
+    _hash_cache: Optional[int] = attrib(init=False, default=None, eq=False, repr=False)
 
     def __attrs_post_init__(self) -> None:
-        for key in self._data:
-            check_arg(
-                "." not in key, "Parameter keys cannot contain namespace separator '.'"
+        Parameters._check_keys(self._data)
+
+    @staticmethod
+    def _check_keys(data: Mapping[str, Any]) -> None:
+        # a single regex scan over all the keys runs in C rather than
+        # checking each key at the Python level.
+        check_arg(
+            not _NAMESPACE_SEPARATOR_REGEX.search("\x00".join(data)),
+            "Parameter keys cannot contain namespace separator '.'",
+        )
+
+    def __hash__(self) -> int:
+        if self._hash_cache is None:
+            # parameter values need not be hashable, so we hash only the parameter names.
+            # this is only a cache, so we bypass the usual immutability of Parameters
+            object.__setattr__(
+                self, "_hash_cache", hash((self.namespace_prefix, frozenset(self._data)))
             )
+        return self._hash_cache  # type: ignore
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # We pickle only the parameters themselves and not the caches.
+        # In particular, the cached hash depends on the string hashing seed of this process,
+        # so it would be wrong in a process which unpickles us.
+        # attrs generates __getstate__ and __setstate__ for slotted classes,
+        # so we customize pickling here instead.
+        return (Parameters._unchecked, (self._data, self.namespace_prefix))
+
+    @property
+    def data(self) -> Mapping[str, Any]:
+        """
+        A read-only view of the top-level mappings of this `Parameters`.
+        """
+        return MappingProxyType(self._data)
 
     @staticmethod
     def empty(*, namespace_prefix: Iterable[str] = tuple()) -> "Parameters":
         """
         A `Parameters` with no parameter mappings.
         """
-        return Parameters.from_mapping(
-            ImmutableDict.empty(), namespace_prefix=namespace_prefix
-        )
+        if not namespace_prefix:
+            return _EMPTY_PARAMETERS
+        return Parameters._unchecked({}, _to_tuple_fast(namespace_prefix))
+
+    @staticmethod
+    def _unchecked(
+        data: Dict[str, Any], namespace_prefix: Tuple[str, ...]
+    ) -> "Parameters":
+        """
+        Create a `Parameters` without copying *data* and without running the attrs converters
+        or key validation.
+
+        Only use this when *data* is a fresh dict which will never be mutated,
+        whose keys are known to be valid, and when *namespace_prefix* is a tuple.
+        This must set every field of `Parameters`.
+        """
+        ret = object.__new__(Parameters)
+        object.__setattr__(ret, "_data", data)
+        object.__setattr__(ret, "namespace_prefix", namespace_prefix)
+        object.__setattr__(ret, "_flat_index_cache", None)
+        object.__setattr__(ret, "_namespace_message_cache", None)
+        object.__setattr__(ret, "_hash_cache", None)
+        return ret
 
     @staticmethod
     def from_mapping(
@@ -106,23 +317,20 @@ class Parameters:
         becomes a namespace.
         """
         check_isinstance(mapping, Mapping)
-        ret: List[Tuple[str, Any]] = []
-        for (key, val) in mapping.items():
-            if isinstance(val, Mapping):
-                sub_namespace_prefix = list(namespace_prefix)
-                sub_namespace_prefix.append(key)
-                ret.append(
-                    (
-                        key,
-                        Parameters.from_mapping(
-                            val, namespace_prefix=sub_namespace_prefix
-                        ),
-                    )
-                )
-            else:
-                # this case will also be triggered if the value is already a parameters object
-                ret.append((key, val))
-        return Parameters(ret, namespace_prefix=namespace_prefix)
+        namespace_prefix = tuple(namespace_prefix)
+        # the else case will also be triggered if the value is already a parameters object
+        ret: Dict[str, Any] = {
+            key: Parameters.from_mapping(
+                val, namespace_prefix=_extend_prefix(namespace_prefix, key)
+            )
+            if isinstance(val, Mapping)
+            else val
+            for (key, val) in mapping.items()
+        }
+        # We validate the keys ourselves so we can skip the copying and checks
+        # of the regular constructor.
+        Parameters._check_keys(ret)
+        return Parameters._unchecked(ret, namespace_prefix)
 
     @staticmethod
     def from_key_value_pairs(
@@ -156,17 +364,17 @@ class Parameters:
         """
 
         def dictify(data):
-            if isinstance(data, Dict):
+            if isinstance(data, Parameters):
+                return {k: dictify(v) for (k, v) in data._data.items()}
+            elif isinstance(data, Dict):
                 return data
-            elif isinstance(data, Parameters):
-                return dictify(data._data)
             elif isinstance(data, Mapping):
                 return {k: dictify(v) for (k, v) in data.items()}
             else:
                 # an atomic key value
                 return data
 
-        return dictify(self._data)
+        return dictify(self)
 
     def namespaced_items(self) -> Iterable[Tuple[str, Any]]:
         """
@@ -209,11 +417,34 @@ class Parameters:
         if not isinstance(new_params, Parameters):
             new_params = Parameters.from_mapping(new_params)
 
-        ret = dict()
-        for (key, old_val) in self._data.items():
-            if key in new_params:
-                new_val = new_params._data[key]
-                if isinstance(old_val, Parameters) != isinstance(new_val, Parameters):
+        # We work directly on the underlying dicts rather than using `in` on the Parameters.
+        # Note that, as with `in`, a parameter with a `None` value counts as absent.
+        old_data = self._data
+        new_data = new_params._data
+
+        # Unifying with an empty side is common while loading (for example, the first
+        # included file is unified with empty parameters). The result then has exactly
+        # the data of the other side, so we can share it rather than rebuilding it.
+        if not old_data or not new_data:
+            unchanged = new_params if new_data else self
+            namespace_prefix = _to_tuple_fast(namespace_prefix)
+            if unchanged.namespace_prefix == namespace_prefix:
+                return unchanged
+            return Parameters._unchecked(unchanged._data, namespace_prefix)
+
+        # We copy this side and merge the other side into the copy in a single pass.
+        # This keeps the keys of this side first and in order, followed by any new keys.
+        ret = dict(old_data)
+        for (key, new_val) in new_data.items():
+            old_val = old_data.get(key)
+            if old_val is None:
+                ret[key] = new_val
+            elif new_val is None:
+                # the parameter is absent on the new side, so we keep the old value
+                continue
+            else:
+                old_val_is_namespace = isinstance(old_val, Parameters)
+                if old_val_is_namespace != isinstance(new_val, Parameters):
                     if namespace_prefix:
                         namespace_prefix_str = ".".join(namespace_prefix)
                         param_str = f"{namespace_prefix_str}.{key}"
@@ -224,22 +455,24 @@ class Parameters:
                         f"When unifying parameters, {param_str} is a parameter on one side and a "
                         f"namespace on the other"
                     )
-                elif isinstance(old_val, Parameters):
-                    new_namespace_prefix = list(namespace_prefix)
-                    new_namespace_prefix.append(key)
+                elif old_val_is_namespace:
+                    new_namespace_prefix = _extend_prefix(tuple(namespace_prefix), key)
                     ret[key] = old_val.unify(
                         new_val, namespace_prefix=new_namespace_prefix
                     )
                 else:
                     ret[key] = new_val
-            else:
-                ret[key] = old_val
-
-        for (key, new_val) in new_params._data.items():
-            if key not in self:
-                ret[key] = new_val
 
-        return Parameters.from_mapping(ret, namespace_prefix=namespace_prefix)
+        # The keys of both sides were validated when they were constructed,
+        # so we needn't check them again as from_mapping would.
+        namespace_prefix = _to_tuple_fast(namespace_prefix)
+        for (key, val) in ret.items():
+            # only possible for Parameters constructed directly from nested dicts
+            if isinstance(val, Mapping):
+                ret[key] = Parameters.from_mapping(
+                    val, namespace_prefix=_extend_prefix(namespace_prefix, key)
+                )
+        return Parameters._unchecked(ret, namespace_prefix)
 
     def creatable_directory(self, param: str) -> Path:
         """
@@ -251,8 +484,12 @@ class Parameters:
 
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        ret = Path.resolve(Path(self.string(param)))
-        ret.mkdir(parents=True, exist_ok=True)
+        return self._creatable_directory(self.string(param))
+
+    @staticmethod
+    def _creatable_directory(path_string: str) -> Path:
+        ret = _absolute_path(path_string)
+        _ensure_directory_exists(ret)
         return ret
 
     def optional_creatable_directory(self, param: str) -> Optional[Path]:
@@ -267,8 +504,9 @@ class Parameters:
 
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        if param in self:
-            return self.creatable_directory(param)
+        path_string = self._optional_typed_get(param, str)
+        if path_string is not None:
+            return self._creatable_directory(path_string)
         else:
             return None
 
@@ -286,25 +524,37 @@ class Parameters:
 
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        ret = Path.resolve(Path(self.string(param)))
-        if ret.is_dir():
-            if not is_empty_directory(ret):
+        return self._creatable_empty_directory(param, self.string(param), delete=delete)
+
+    @staticmethod
+    def _creatable_empty_directory(param: str, path_string: str, *, delete: bool) -> Path:
+        ret = _absolute_path(path_string)
+        ret_stat = _stat_or_none(ret)
+        if ret_stat is not None and S_ISDIR(ret_stat.st_mode):
+            # we already know this is a directory, so we only need to check for an entry
+            with os.scandir(ret) as entries:
+                is_empty = next(entries, None) is None
+            if not is_empty:
                 if delete:
                     shutil.rmtree(str(ret))
-                    ret.mkdir(parents=True, exist_ok=True)
+                    _forget_created_directories_under(ret)
+                    _ensure_directory_exists(ret)
                 else:
                     raise ParameterError(
                         "Expected an empty directory for parameters {!s},"
                         "but got non-empty path {!s}".format(param, ret)
                     )
             return ret
-        elif ret.exists():
+        elif ret_stat is not None:
             raise ParameterError(
                 "Expected an empty directory for parameters {!s},"
                 "but got non-directory {!s}".format(param, ret)
             )
         else:
-            return self.creatable_directory(param)
+            # We have just seen that the directory does not exist,
+            # so we create it without consulting the cache of directories created before.
+            ret.mkdir(parents=True, exist_ok=True)
+            return ret
 
     def optional_creatable_empty_directory(
         self, param: str, *, delete: bool = False
@@ -324,8 +574,9 @@ class Parameters:
 
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        if param in self:
-            return self.creatable_empty_directory(param, delete=delete)
+        path_string = self._optional_typed_get(param, str)
+        if path_string is not None:
+            return self._creatable_empty_directory(param, path_string, delete=delete)
         else:
             return None
 
@@ -339,8 +590,12 @@ class Parameters:
 
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        ret = Path.resolve(Path(self.string(param)))
-        ret.parent.mkdir(parents=True, exist_ok=True)
+        return self._creatable_file(self.string(param))
+
+    @staticmethod
+    def _creatable_file(path_string: str) -> Path:
+        ret = _absolute_path(path_string)
+        _ensure_directory_exists(ret.parent)
         return ret
 
     def optional_creatable_file(self, param: str) -> Optional[Path]:
@@ -349,40 +604,47 @@ class Parameters:
 
         Just like `creatable_file` but returns `None` if the parameter is absent.
         """
-        if param in self:
-            return self.creatable_file(param)
+        path_string = self._optional_typed_get(param, str)
+        if path_string is not None:
+            return self._creatable_file(path_string)
         else:
             return None
 
-    def existing_file(self, param: str) -> Path:
+    def existing_file(self, param: str, *, resolve: bool = False) -> Path:
         """
         Gets a path for an existing file.
 
         Interprets the string-valued parameter `param` as a file path. Throws a `ParameterError`
         if the path does not exist or is not a file.
 
+        The returned path is absolute.  If *resolve* is specified, symbolic links and ``..``
+        components are also resolved.
+
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        ret = Path.resolve(Path(self.string(param)))
-        if ret.exists():
-            if ret.is_file():
+        return self._existing_file(param, self.string(param), resolve=resolve)
+
+    @staticmethod
+    def _existing_file(param: str, path_string: str, *, resolve: bool = False) -> Path:
+        ret = _absolute_path(path_string, resolve=resolve)
+        ret_stat = _stat_or_none(ret)
+        if ret_stat is not None:
+            if S_ISREG(ret_stat.st_mode):
                 return ret
             else:
                 raise ParameterError(
-                    "For parameter "
-                    + param
-                    + ", expected an existing file but got existing non-file "
-                    + str(ret)
+                    f"For parameter {param}, expected an existing file but got existing "
+                    f"non-file {ret}"
                 )
         else:
             raise ParameterError(
-                "For parameter "
-                + param
-                + ", expected an existing file but got non-existent "
-                + str(ret)
+                f"For parameter {param}, expected an existing file but got non-existent "
+                f"{ret}"
             )
 
-    def optional_existing_file(self, param: str) -> Optional[Path]:
+    def optional_existing_file(
+        self, param: str, *, resolve: bool = False
+    ) -> Optional[Path]:
         """
         Gets a path for an existing file, if specified.
 
@@ -390,40 +652,49 @@ class Parameters:
         if no parameter by that name is present.  Throws a `ParameterError`
         if the path does not exist.
         """
-        if param in self:
-            return self.existing_file(param)
+        path_string = self._optional_typed_get(param, str)
+        if path_string is not None:
+            return self._existing_file(param, path_string, resolve=resolve)
         else:
             return None
 
-    def existing_directory(self, param: str) -> Path:
+    def existing_directory(self, param: str, *, resolve: bool = False) -> Path:
         """
         Gets a path for an existing directory.
 
         Interprets the string-valued parameter `param` as a directory path. Throws a
         `ParameterError` if the path does not exist or is not a directory.
 
+        The returned path is absolute.  If *resolve* is specified, symbolic links and ``..``
+        components are also resolved.
+
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        ret = Path.resolve(Path(self.string(param)))
-        if ret.exists():
-            if ret.is_dir():
+        return self._existing_directory(param, self.string(param), resolve=resolve)
+
+    @staticmethod
+    def _existing_directory(
+        param: str, path_string: str, *, resolve: bool = False
+    ) -> Path:
+        ret = _absolute_path(path_string, resolve=resolve)
+        ret_stat = _stat_or_none(ret)
+        if ret_stat is not None:
+            if S_ISDIR(ret_stat.st_mode):
                 return ret
             else:
                 raise ParameterError(
-                    "For parameter "
-                    + param
-                    + ", expected an existing directory but got existing "
-                    "non-directory " + str(ret)
+                    f"For parameter {param}, expected an existing directory but got "
+                    f"existing non-directory {ret}"
                 )
         else:
             raise ParameterError(
-                "For parameter "
-                + param
-                + ", expected an existing directory but got non-existent "
-                + str(ret)
+                f"For parameter {param}, expected an existing directory but got "
+                f"non-existent {ret}"
             )
 
-    def optional_existing_directory(self, param: str) -> Optional[Path]:
+    def optional_existing_directory(
+        self, param: str, *, resolve: bool = False
+    ) -> Optional[Path]:
         """
         Gets a path for an existing directory, if specified.
 
@@ -431,11 +702,59 @@ class Parameters:
         If the parameter is not present, returns `None`.  Throws a
         `ParameterError` if the path does not exist.
         """
-        if param in self:
-            return self.existing_directory(param)
+        path_string = self._optional_typed_get(param, str)
+        if path_string is not None:
+            return self._existing_directory(param, path_string, resolve=resolve)
         else:
             return None
 
+    def existing_files(
+        self, params: Iterable[str], *, max_workers: int = 16
+    ) -> Sequence[Path]:
+        """
+        Gets paths for several existing files at once.
+
+        This is equivalent to calling `existing_file` on each of `params` in turn,
+        except that the files are checked concurrently using up to `max_workers` threads.
+        This is much faster when checking many files on a network filesystem.
+        """
+        return self._check_paths_concurrently(
+            params, Parameters._existing_file, max_workers=max_workers
+        )
+
+    def existing_directories(
+        self, params: Iterable[str], *, max_workers: int = 16
+    ) -> Sequence[Path]:
+        """
+        Gets paths for several existing directories at once.
+
+        This is equivalent to calling `existing_directory` on each of `params` in turn,
+        except that the directories are checked concurrently
+        using up to `max_workers` threads.
+        """
+        return self._check_paths_concurrently(
+            params, Parameters._existing_directory, max_workers=max_workers
+        )
+
+    def _check_paths_concurrently(
+        self,
+        params: Iterable[str],
+        check: Callable[[str, str], Path],
+        *,
+        max_workers: int,
+    ) -> Sequence[Path]:
+        check_arg(
+            max_workers > 0, "max_workers must be positive but got %s", (max_workers,)
+        )
+        params = tuple(params)
+        # We look up all the parameters first so a missing one is reported before any I/O.
+        path_strings = [self.string(param) for param in params]
+        if len(params) < 2:
+            return tuple(map(check, params, path_strings))
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(params))) as executor:
+            # like map, this reports the error for the first bad path in params order
+            return tuple(executor.map(check, params, path_strings))
+
     def enum(
         self,
         param_name: str,
@@ -457,7 +776,7 @@ class Parameters:
                 f"For parameter {param_name}, {enum_name} could not be found in "
                 f"{list(enum_class.__members__)}"
             )
-        elif default:
+        elif default is not None:
             return default
         else:
             # Always raises error since param_name returned None on `optional_string()`
@@ -474,13 +793,20 @@ class Parameters:
 
         Throws a `ParameterError` if `param` is not a known parameter.
         """
-        ret = self.get(param_name, str, default=default)
-        if valid_options is not None and ret not in valid_options:
+        return self._check_valid_option(
+            param_name, self.get(param_name, str, default=default), valid_options
+        )
+
+    @staticmethod
+    def _check_valid_option(
+        param_name: str, value: str, valid_options: Optional[Iterable[str]]
+    ) -> str:
+        if valid_options is not None and value not in valid_options:
             raise ParameterError(
-                f"The value {ret} for the parameter {param_name} is not one of the valid options "
-                f"{tuple(valid_options)}"
+                f"The value {value} for the parameter {param_name} is not one of the valid "
+                f"options {tuple(valid_options)}"
             )
-        return ret
+        return value
 
     @overload
     def optional_string(
@@ -514,13 +840,18 @@ class Parameters:
         """
         if default is not None:
             self._warn_about_default()
-        if param_name in self:
-            return self.string(param_name, valid_options)
+        ret = self._optional_typed_get(param_name, str)
+        if ret is not None:
+            return self._check_valid_option(param_name, ret, valid_options)
         else:
             return default  # type: ignore
 
     def __contains__(self, param_name: str) -> bool:
-        return self._private_get(param_name, optional=True) is not None
+        # This is equivalent to checking whether an optional lookup is not None,
+        # but avoids the overhead of _private_get.
+        if "." in param_name:
+            return self._flat_index().get(param_name) is not None
+        return self._data.get(param_name) is not None
 
     def namespace(self, name: str) -> "Parameters":
         """
@@ -546,7 +877,7 @@ class Parameters:
         """
         Gets an integer parameter.
         """
-        ret = self.get(name, int, default=default)
+        ret = self._check_not_boolean(name, self.get(name, int, default=default))
         if ret not in valid_range:
             raise ParameterError(
                 f"Invalid value for integer parameter {name}. Expected a value in {valid_range}."
@@ -570,8 +901,9 @@ class Parameters:
         if default is not None:  # pragma: no cover
             self._warn_about_default()
 
-        if name in self:
-            return self.integer(name)
+        ret = self._optional_typed_get(name, int)
+        if ret is not None:
+            return self._check_not_boolean(name, ret)
         else:
             return default  # type: ignore
 
@@ -581,13 +913,22 @@ class Parameters:
 
         Throws an exception if the parameter is present but is not a positive integer.
         """
-        ret = self.integer(name, default=default)
-        if ret > 0:
-            return ret
+        return self._check_positive(name, self.integer(name, default=default))
+
+    def _check_not_boolean(self, name: str, value: int) -> int:
+        # bool is a subclass of int, so the type check in get alone would let booleans through
+        if type(value) is bool:  # pylint:disable=unidiomatic-typecheck
+            raise self._wrong_type_error(name, int, value)
+        return value
+
+    @staticmethod
+    def _check_positive(name: str, value: int) -> int:
+        if value > 0:
+            return value
         else:
             raise ParameterError(
                 "For parameter {!s}, expected a positive integer but got {!s}".format(
-                    name, ret
+                    name, value
                 )
             )
 
@@ -609,9 +950,10 @@ class Parameters:
         if default is not None:
             self._warn_about_default()
 
-        if name in self:
-            return self.positive_integer(name)
-        if default:
+        ret = self._optional_typed_get(name, int)
+        if ret is not None:
+            return self._check_positive(name, self._check_not_boolean(name, ret))
+        if default is not None:
             if isinstance(default, int) and default > 0:
                 return default  # type: ignore
             else:
@@ -632,14 +974,21 @@ class Parameters:
 
         This method isn't called `float` to avoid a clash with the Python type.
         """
-        ret = self.get(name, float, default=default)
-        if valid_range is not None and ret not in valid_range:
+        return self._check_in_float_range(
+            name, self.get(name, float, default=default), valid_range
+        )
+
+    @staticmethod
+    def _check_in_float_range(
+        name: str, value: float, valid_range: Optional[Range[float]]
+    ) -> float:
+        if valid_range is not None and value not in valid_range:
             raise ParameterError(
                 "For parameter {!s}, expected a float in the range {!s} but got {!s}".format(
-                    name, valid_range, ret
+                    name, valid_range, value
                 )
             )
-        return ret
+        return value
 
     @overload
     def optional_floating_point(
@@ -668,9 +1017,10 @@ class Parameters:
         if default is not None:
             self._warn_about_default()
 
-        if name in self:
-            return self.floating_point(name, valid_range)
-        if default:
+        ret = self._optional_typed_get(name, float)
+        if ret is not None:
+            return self._check_in_float_range(name, ret, valid_range)
+        if default is not None:
             if (
                 valid_range is not None
                 and isinstance(default, float)
@@ -762,9 +1112,9 @@ class Parameters:
         if isinstance(ret, Parameters):
             return ret
         elif ret is None:
-            sub_namespace_prefix = list(self.namespace_prefix)
-            sub_namespace_prefix.append(name)
-            return Parameters.empty(namespace_prefix=sub_namespace_prefix)
+            return Parameters.empty(
+                namespace_prefix=_extend_prefix(self.namespace_prefix, name)
+            )
         else:
             raise ParameterError(
                 f"Expected a namespace, but got a regular parameters for {name}"
@@ -791,7 +1141,7 @@ class Parameters:
         if default is not None:  # pragma: no cover
             self._warn_about_default()
 
-        if not default:
+        if default is None:
             return self.get_optional(name, List)
         elif isinstance(default, List):
             return self.get_optional(name, List, default=default)
@@ -806,7 +1156,7 @@ class Parameters:
         expected_type: Type[_ParamType],
         *,
         namespace_param_name: str = "value",
-        special_values: Mapping[str, str] = ImmutableDict.empty(),
+        special_values: Mapping[str, str] = _EMPTY_MAPPING,
     ) -> Optional[_ParamType]:
         """
         Get a parameter, if present, interpreting its value as Python code.
@@ -835,7 +1185,6 @@ class Parameters:
         parts = maybe_fully_qualified_name.split(".")[:-1]
         return [".".join(parts[0 : i + 1]) for i in range(len(parts))]
 
-    # type ignored because ImmutableDict.empty() has type Dict[Any, Any]
     def evaluate(
         self,
         name: str,
@@ -843,7 +1192,7 @@ class Parameters:
         *,
         context: Optional[Mapping] = None,
         namespace_param_name: str = "value",
-        special_values: Mapping[str, str] = ImmutableDict.empty(),
+        special_values: Mapping[str, str] = _EMPTY_MAPPING,
         default: Optional[_ParamType] = None,
     ) -> _ParamType:
         """
@@ -858,8 +1207,9 @@ class Parameters:
         If the type of the result of the evaluation doesn't match `expected_type`, a
         `ParameterError` is raised.
 
-        If `context` is specified, evaluation will happen in the context given. If you want
-        evaluation to happen in the calling context, pass `locals()`.
+        If `context` is specified, evaluation will happen in the context given; otherwise
+        it happens in an empty context. If you want evaluation to happen in the calling
+        context, pass `locals()`.
         If the namespace contains the parameter *import*, it will be interpreted
         as a list of modules to import into the context before evaluation.
 
@@ -874,32 +1224,31 @@ class Parameters:
         the packages *foo*, *foo.bar*, and *foo.bar.baz* will be imported,
         allowing the evaluation of *foot.bar.baz.some_function* to succeed.
         """
-
-        def handle_special_values(val: str) -> str:
-            return special_values.get(val, val)
-
-        namespace = self.optional_namespace(name)
+        # we look the parameter up only once, whether it is a namespace or a string
+        namespace_or_value = self._private_get(name, optional=True)
         try:
-            to_evaluate = None
-            context_modules: Sequence = []
-
-            if namespace:
-                to_evaluate = namespace.string(namespace_param_name)
-                context_modules = namespace.optional_arbitrary_list("import") or []
-            elif name in self:
-                to_evaluate = self.string(name)
-                # See special case in docstring.
-                context_modules = Parameters._context_modules_from_prefix(
-                    self.string(name)
+            to_evaluate: str
+            context_modules: Sequence
+
+            if isinstance(namespace_or_value, Parameters):
+                to_evaluate = namespace_or_value.string(namespace_param_name)
+                context_modules = (
+                    namespace_or_value.optional_arbitrary_list("import") or []
                 )
+            elif namespace_or_value is not None:
+                if not isinstance(namespace_or_value, str):
+                    raise self._wrong_type_error(name, str, namespace_or_value)
+                to_evaluate = namespace_or_value
+                # See special case in docstring.
+                context_modules = Parameters._context_modules_from_prefix(to_evaluate)
             elif default is not None:
                 return default
             else:
                 raise ParameterError(f"Cannot evaluate non-existent parameter {name}")
 
             return eval_in_context_of_modules(
-                handle_special_values(to_evaluate),
-                context or locals(),
+                special_values.get(to_evaluate, to_evaluate),
+                context if context is not None else _EMPTY_MAPPING,
                 context_modules=context_modules,
                 expected_type=expected_type,
             )
@@ -908,7 +1257,6 @@ class Parameters:
                 "Error while evaluating parameter {!s}".format(name)
             ) from e
 
-    # type ignored because ImmutableDict.empty() has type Dict[Any, Any]
     def object_from_parameters(
         self,
         name: str,
@@ -917,8 +1265,8 @@ class Parameters:
         context: Optional[Mapping] = None,
         value_namespace_param_name: str = "value",
         factory_namespace_param_name: str = "factory",
-        special_values: Mapping[str, Any] = immutabledict(),
-        special_factories: Mapping[str, Any] = immutabledict(),
+        special_values: Mapping[str, Any] = _EMPTY_MAPPING,
+        special_factories: Mapping[str, Any] = _EMPTY_MAPPING,
         default_value: Optional[Any] = None,
         default_factory: Optional[Union[Callable[[Any], Any], Type[Any]]] = None,
     ) -> _ParamType:
@@ -982,17 +1330,13 @@ class Parameters:
                 )
 
         def apply_factory(factory, params_to_pass):
-            if inspect.isclass(factory):
-                if hasattr(factory, "from_parameters"):
-                    return getattr(factory, "from_parameters")(params_to_pass)
-                else:
-                    return factory()  # type: ignore
-            elif callable(factory):
-                return factory(params_to_pass)
+            factory_kind = _factory_kind(factory)
+            if factory_kind is _FactoryKind.FROM_PARAMETERS:
+                return factory.from_parameters(params_to_pass)
+            elif factory_kind is _FactoryKind.NO_ARGUMENT_CONSTRUCTOR:
+                return factory()  # type: ignore
             else:
-                raise ParameterError(
-                    f"Expected a class with from_parameters or a callable but got {factory}"
-                )
+                return factory(params_to_pass)
 
         if name in self:
             if self.has_namespace(name):
@@ -1098,15 +1442,18 @@ class Parameters:
         Throws a `ParameterError` if the parameter is unknown.
         """
 
-        ret = self._private_get(param_name, default=default)
-        if isinstance(ret, param_type):
+        # Most lookups are of parameters directly in this namespace,
+        # which a single lookup in our own data answers without calling _private_get.
+        # Dotted names can never be found this way, since keys cannot contain '.'.
+        ret = self._data.get(param_name, _SENTINEL)
+        if ret is _SENTINEL:
+            ret = self._private_get(param_name, default=default)
+        # An exact type match (the usual case for builtins) is a cheap identity check.
+        # Every value is an object, so we needn't ask isinstance for that either.
+        if type(ret) is param_type or param_type is object or isinstance(ret, param_type):
             return ret
         else:
-            raise ParameterError(
-                f"{self._namespace_message()}When looking up parameter '{param_name}', "
-                f"expected a value of type {param_type}, but got {ret} "
-                f"of type {type(ret)}"
-            )
+            raise self._wrong_type_error(param_name, param_type, ret)
 
     @overload
     def get_optional(
@@ -1135,18 +1482,42 @@ class Parameters:
         if default is not None:
             self._warn_about_default()
 
-        ret = self._private_get(param_name, optional=True)
+        ret = self._optional_typed_get(param_name, param_type)
         if ret is not None:
-            if isinstance(ret, param_type):
-                return ret
-            else:
-                raise ParameterError(
-                    "When looking up parameter '{!s}', expected a value of type {!s}, but got {!s} "
-                    "of type {!s}".format(param_name, param_type, ret, type(ret))
-                )
+            return ret
         else:
             return default
 
+    def _optional_typed_get(
+        self, param_name: str, param_type: Type[_ParamType]
+    ) -> Optional[_ParamType]:
+        """
+        Get a parameter with type-safety using a single lookup, returning `None` if it is absent.
+
+        The `optional_*` accessors use this rather than checking whether the parameter is present
+        and then looking it up again.
+        """
+        ret = self._private_get(param_name, optional=True)
+        # see get for why we check the exact type first
+        if (
+            ret is None
+            or type(ret) is param_type
+            or param_type is object
+            or isinstance(ret, param_type)
+        ):
+            return ret
+        else:
+            raise self._wrong_type_error(param_name, param_type, ret)
+
+    def _wrong_type_error(
+        self, param_name: str, param_type: Type, value: Any
+    ) -> ParameterError:
+        return ParameterError(
+            f"{self._namespace_message()}When looking up parameter '{param_name}', "
+            f"expected a value of type {param_type}, but got {value} "
+            f"of type {type(value)}"
+        )
+
     def assert_exactly_one_present(self, param_names: Iterable[str]) -> None:
         params_present = [param for param in param_names if param in self]
         if params_present:
@@ -1192,19 +1563,24 @@ class Parameters:
         raw_param_value = self._private_get(param)
         if isinstance(raw_param_value, str):
             list_file = self.existing_file(param)
-            path_strings = [
-                line.strip()
-                for line in list_file.read_text(encoding="utf-8").splitlines()
-                if line.strip() and not line.strip().startswith("#")
-            ]
+            with open(list_file, encoding="utf-8") as inp:
+                # lines are streamed and stripped exactly once each
+                stripped_lines = (line.strip() for line in inp)
+                path_strings = [
+                    stripped_line
+                    for stripped_line in stripped_lines
+                    if stripped_line and stripped_line[0] != "#"
+                ]
             location_read_from = f"file {list_file.absolute()!s}"
         else:
-            path_strings = self.arbitrary_list(param)
+            path_strings = [
+                path_string.strip() for path_string in self.arbitrary_list(param)
+            ]
             location_read_from = "parameter file directly"
         ret = tuple(
-            resolve_relative_to / path_string.strip()
+            resolve_relative_to / path_string
             if resolve_relative_to
-            else Path(path_string.strip())
+            else Path(path_string)
             for path_string in path_strings
         )
         logging.info(
@@ -1231,24 +1607,23 @@ class Parameters:
         will be resolved relative to *resolve_relative_to* if it is specified.
         """
         file_map_file = self.existing_file(param)
-        with open(str(file_map_file), encoding="utf-8") as inp:
-            ret_b: ImmutableDict.Builder[str, Path] = ImmutableDict.builder()
+        with open(file_map_file, encoding="utf-8") as inp:
+            key_to_path: Dict[str, Path] = {}
             for (line_num, line) in enumerate(inp):
                 try:
-                    parts = line.split("\t")
-                    if len(parts) != 2:
+                    key_part, separator, path_part = line.partition("\t")
+                    if not separator or "\t" in path_part:
                         raise IOError(
                             "Expected two tab-separated fields but got {!s}".format(
-                                len(parts)
+                                line.count("\t") + 1
                             )
                         )
-                    path_part = parts[1].strip()
-                    path = (
+                    path_part = path_part.strip()
+                    key_to_path[key_part.strip()] = (
                         resolve_relative_to / path_part
                         if resolve_relative_to
                         else Path(path_part)
                     )
-                    ret_b.put(parts[0].strip(), path)
                 except Exception as e:
                     raise IOError(
                         "Error parsing line {!s} of {!s}:\n{!s}".format(
@@ -1256,30 +1631,76 @@ class Parameters:
                         )
                     ) from e
 
-            ret = ret_b.build()
-            if log_name:
-                _logger.info("Loaded %s %s from %s", len(ret), log_name, file_map_file)
-            return ret
+        ret: ImmutableDict[str, Path] = immutabledict(key_to_path.items())
+        if log_name:
+            _logger.info("Loaded %s %s from %s", len(ret), log_name, file_map_file)
+        return ret
 
     def pickled_object_from_file(self, param_name: str) -> Any:
         """
         Returns an unpickled object from file containing a pickled object at param_name
+
+        The file may be compressed with gzip or bzip2; this is detected automatically.
+        For large pickles on slow storage, writing them with
+        `gzip.open(path, 'wb', compresslevel=1)` can make loading considerably faster.
         """
         pickled_object_path = self.existing_file(param_name)
         with pickled_object_path.open("rb") as pickled_object_file:
-            return pickle.load(pickled_object_file)
+            magic_bytes = pickled_object_file.read(3)
+            pickled_object_file.seek(0)
+            # We stream compressed pickles, since their size on disk
+            # does not bound how large they are once decompressed.
+            if magic_bytes.startswith(_GZIP_MAGIC_BYTES):
+                return pickle.load(
+                    gzip.GzipFile(fileobj=pickled_object_file, mode="rb")  # type: ignore
+                )
+            elif magic_bytes == _BZIP2_MAGIC_BYTES:
+                return pickle.load(bz2.BZ2File(pickled_object_file, mode="rb"))
+            elif (
+                os.fstat(pickled_object_file.fileno()).st_size
+                <= _MAX_PICKLE_BYTES_TO_READ_AT_ONCE
+            ):
+                # unpickling from an in-memory buffer avoids many small reads on the file object
+                return pickle.loads(pickled_object_file.read())
+            else:
+                return pickle.load(pickled_object_file)
 
     def _private_get(
         self, param_name: str, *, optional: bool = False, default: Optional[Any] = None
     ) -> Any:
         check_arg(isinstance(param_name, str))
         # pylint:disable=protected-access
-        param_components = param_name.split(".")
-        check_arg(param_components, "Parameter name cannot be empty")
+        if "." in param_name:
+            # Dotted names can be answered with a single dict lookup
+            # in an index memoized on this object.
+            # We fall back to walking the namespaces below only for failed lookups
+            # which are errors, so that we produce the appropriate error messages.
+            flat_index = self._flat_index()
+            if param_name in flat_index:
+                return flat_index[param_name]
+            elif default is not None:
+                return default
+            elif optional:
+                return None
+        else:
+            # Undotted names need only a single lookup in our own data.
+            ret = self._data.get(param_name, _SENTINEL)
+            if ret is not _SENTINEL:
+                return ret
+            elif default is not None:
+                return default
+            elif optional:
+                return None
 
+        # We walk the namespaces one component of the name at a time using partition,
+        # so no list of components need be built.
         current = self
-        namespaces_processed = []
-        for param_component in param_components:
+        remaining_name = param_name
+        # the length of the prefix of param_name naming the namespaces we have walked through
+        processed_length = 0
+        any_processed = False
+        while True:
+            (param_component, separator, remaining_name) = remaining_name.partition(".")
             if not isinstance(current, Parameters):
                 if default is not None:
                     return default
@@ -1287,66 +1708,98 @@ class Parameters:
                     return None
                 else:
                     raise ParameterError(
-                        self._namespace_message()
-                        + "When getting parameter "
-                        + param_name
-                        + " expected "
-                        + ".".join(namespaces_processed)
-                        + " to be a map, but it is a leaf: "
-                        + str(current)
-                        + ". Maybe you mistakenly prefixed the map keys with '-'?"
+                        f"{self._namespace_message()}When getting parameter {param_name} "
+                        f"expected {param_name[:processed_length]} to be a map, but it is "
+                        f"a leaf: {current}. Maybe you mistakenly prefixed the map keys "
+                        f"with '-'?"
                     )
 
-            if param_component in current._data:
-                current = current._data[param_component]
-                namespaces_processed.append(param_component)
+            # a single load of the namespace's data serves both the test and the lookup
+            current_data = current._data
+            if param_component in current_data:
+                current = current_data[param_component]
+                if any_processed:
+                    processed_length += 1
+                processed_length += len(param_component)
+                any_processed = True
             elif default is not None:
                 return default
             elif optional:
                 return None
             else:
-                if namespaces_processed:
-                    context_string = "in context " + ".".join(namespaces_processed)
-                else:
-                    context_string = "in root context"
-                available_parameters = str(
-                    [
-                        key
-                        for (key, val) in current._data.items()
-                        if not isinstance(val, Parameters)
-                    ]
-                )
-                available_namespaces = str(
-                    [
-                        key
-                        for (key, val) in current._data.items()
-                        if isinstance(val, Parameters)
-                    ]
-                )
                 raise ParameterError(
-                    self._namespace_message()
-                    + "Parameter "
-                    + param_name
-                    + " not found. In "
-                    + context_string
-                    + " available parameters are "
-                    + available_parameters
-                    + ", available namespaces are "
-                    + available_namespaces
+                    self._parameter_not_found_message(
+                        param_name,
+                        current,
+                        param_name[:processed_length] if any_processed else None,
+                    )
                 )
-        return current
+            if not separator:
+                return current
+
+    def _parameter_not_found_message(
+        self, param_name: str, context: "Parameters", context_name: Optional[str]
+    ) -> str:
+        """
+        Builds the error message for a missing parameter.
+
+        This is kept out of `_private_get` so the listing of what is available
+        in `context` is only computed when we actually fail.
+        """
+        # pylint:disable=protected-access
+        context_string = (
+            f"in context {context_name}"
+            if context_name is not None
+            else "in root context"
+        )
+        available_parameters: List[str] = []
+        available_namespaces: List[str] = []
+        for (key, val) in context._data.items():
+            if isinstance(val, Parameters):
+                available_namespaces.append(key)
+            else:
+                available_parameters.append(key)
+        return (
+            f"{self._namespace_message()}Parameter {param_name} not found. In "
+            f"{context_string} available parameters are {available_parameters}, "
+            f"available namespaces are {available_namespaces}"
+        )
+
+    def _flat_index(self) -> Dict[str, Any]:
+        """
+        Get a map from the dotted names of all parameters and namespaces in this `Parameters`
+        (relative to this `Parameters`, not including `namespace_prefix`) to their values.
+        """
+        # pylint:disable=protected-access
+        if self._flat_index_cache is None:
+            flat_index: Dict[str, Any] = {}
+            to_index: List[Tuple[str, Parameters]] = [("", self)]
+            while to_index:
+                (name_prefix, params) = to_index.pop()
+                for (key, val) in params._data.items():
+                    param_name = name_prefix + key
+                    flat_index[param_name] = val
+                    if isinstance(val, Parameters):
+                        to_index.append((param_name + ".", val))
+            # this is only a cache, so we bypass the usual immutability of Parameters
+            object.__setattr__(self, "_flat_index_cache", flat_index)
+            return flat_index
+        return self._flat_index_cache
 
     def __str__(self) -> str:
-        str_sink = CharSink.to_string()
-        YAMLParametersWriter().write(self, str_sink)
-        return str_sink.last_string_written
+        # we dump straight to a string rather than going through a CharSink
+        return YAMLParametersWriter._dump(self)  # type: ignore
 
     def _namespace_message(self) -> str:
-        if self.namespace_prefix:
-            namespace_str = ".".join(self.namespace_prefix)
-            return f"In namespace {namespace_str}: "
-        else:
-            return ""
+        if self._namespace_message_cache is None:
+            if self.namespace_prefix:
+                namespace_str = ".".join(self.namespace_prefix)
+                namespace_message = f"In namespace {namespace_str}: "
+            else:
+                namespace_message = ""
+            # this is only a cache, so we bypass the usual immutability of Parameters
+            object.__setattr__(self, "_namespace_message_cache", namespace_message)
+        return self._namespace_message_cache  # type: ignore
 
     @deprecation.deprecated(
         deprecated_in="0.19.0",
@@ -1354,7 +1807,7 @@ class Parameters:
         details="Deprecated and may be removed. Prefer `Parameters.as_nested_dicts`.",
     )
     def as_mapping(self) -> Mapping[str, Any]:
-        return self._data
+        return self.data
 
     def _warn_about_default(self) -> None:
         logging.warning(
@@ -1363,12 +1816,38 @@ class Parameters:
         )
 
 
+def _restore_pickled_parameters_state(params: Parameters, state: Any) -> None:
+    """
+    Restore a `Parameters` pickled by an older version of this module.
+
+    Those pickles hold the state written by the attrs-generated ``__getstate__``
+    (a tuple of field values or a dict of them, depending on the attrs version),
+    which lacks the cache fields and holds the parameter data as an `ImmutableDict`.
+    `Parameters` pickled now go through `Parameters.__reduce__` instead.
+    """
+    if isinstance(state, dict):
+        data = state["_data"]
+        namespace_prefix = state.get("namespace_prefix", ())
+    else:
+        (data, namespace_prefix) = state[:2]
+    object.__setattr__(params, "_data", dict(data))
+    object.__setattr__(params, "namespace_prefix", _to_tuple_fast(namespace_prefix))
+    object.__setattr__(params, "_flat_index_cache", None)
+    object.__setattr__(params, "_namespace_message_cache", None)
+    object.__setattr__(params, "_hash_cache", None)
+
+
+# attrs replaces any __setstate__ defined in the body of a slotted class, so we set it here.
+Parameters.__setstate__ = _restore_pickled_parameters_state  # type: ignore
+
+# shared by all requests for an empty Parameters without a namespace prefix
+_EMPTY_PARAMETERS = Parameters()
+
+
 def _extend_prefix(
     namespace_prefix: Tuple[str, ...], new_element: str
 ) -> Tuple[str, ...]:
-    ret = list(namespace_prefix)
-    ret.append(new_element)
-    return tuple(new_element)
+    return namespace_prefix + (new_element,)
 
 
 @attrs(auto_attribs=True)
@@ -1400,6 +1879,12 @@ class YAMLParametersLoader:
     """
 
     interpolate_environmental_variables: bool = True
+    # Maps parameter file paths to the modification time and size of the file when it was
+    # last parsed and the result of parsing it (see _parse_content),
+    # so files included several times need only be read and parsed once.
+    _parsed_file_cache: Dict[
+        Path, Tuple[Tuple[int, int], Tuple[Sequence[Any], Parameters, bool]]
+    ] = attrib(init=False, factory=dict, eq=False, repr=False)
 
     def load(
         self,
@@ -1435,14 +1920,56 @@ class YAMLParametersLoader:
         if isinstance(f, str):
             f = Path(f)
 
-        return self._inner_load_from_string(
-            f.read_text(encoding="utf-8"),
+        return self._inner_load(
+            f.absolute(),
             error_string=str(f),
             includes_are_relative_to=f.parent,
             included_context=non_none_included_context,
             namespace_path=namespace_path,
         )
 
+    def load_cached(
+        self, f: Union[str, Path], *, cache_directory: Optional[Union[str, Path]] = None
+    ) -> Parameters:
+        """
+        Loads parameters from a YAML file like *load*, caching the result on disk.
+
+        The loaded `Parameters` are pickled to a file alongside *f* with the additional suffix
+        `.pcache`. Later calls reuse these as long as neither *f* nor any file it includes
+        has been modified since. If any of these files use interpolation,
+        the environmental variables must also be unchanged.
+
+        If *cache_directory* is specified, the cache is instead kept in that directory
+        (which will be created if needed) under a name derived from the absolute path of *f*.
+        This is useful when *f* is in a directory you cannot write to; a directory under
+        `$XDG_CACHE_HOME` is a good choice.
+
+        If the cache cannot be read or written, this falls back to loading *f* normally.
+        """
+        if isinstance(f, str):
+            f = Path(f)
+        if cache_directory is not None:
+            path_digest = hashlib.sha256(str(f.absolute()).encode("utf-8")).hexdigest()
+            cache_file = Path(cache_directory, path_digest + _PARAMETERS_CACHE_SUFFIX)
+        else:
+            cache_file = f.with_suffix(f.suffix + _PARAMETERS_CACHE_SUFFIX)
+
+        cached = self._read_parameters_cache(cache_file)
+        if cached is not None:
+            return cached
+
+        # maps each file loaded to its modification time (in nanoseconds) and size
+        # when it was read, and whether it required interpolation
+        loaded_files: Dict[Path, Tuple[int, int, bool]] = {}
+        ret = self._inner_load(
+            f.absolute(),
+            error_string=str(f),
+            includes_are_relative_to=f.parent,
+            loaded_files=loaded_files,
+        )
+        self._write_parameters_cache(cache_file, ret, loaded_files)
+        return ret
+
     def load_string(
         self,
         param_file_content: str,
@@ -1455,7 +1982,7 @@ class YAMLParametersLoader:
 
         This behaves just like *load*, except relative includes are not allowed.
         """
-        return self._inner_load_from_string(
+        return self._inner_load(
             param_file_content,
             error_string=f"String param file:\n{param_file_content}",
             includes_are_relative_to=None,
@@ -1463,99 +1990,310 @@ class YAMLParametersLoader:
             namespace_path=namespace_path,
         )
 
-    def _inner_load_from_string(
+    def _inner_load(
         self,
-        param_file_content: str,
+        source: Union[str, Path],
         error_string: str,
         *,
         included_context: Parameters = Parameters.empty(),
         includes_are_relative_to: Optional[Path] = None,
         namespace_path: Sequence[str] = tuple(),
+        environment: Optional[Parameters] = None,
+        loaded_files: Optional[Dict[Path, Tuple[int, int, bool]]] = None,
+        including_files: Tuple[Path, ...] = tuple(),
     ):
         """
-        Loads parameters from a YAML file.
+        Loads parameters from YAML.
+
+        `source` is either the YAML itself or the path of a YAML file.
+        Files are only read and parsed again if they have been modified since
+        this loader last parsed them.
 
         If `context` is specified, its content will be included in the returned Parameters (if
         not overridden) and will be available for interpolation.
+
+        `environment` holds the environmental variables available for interpolation.
+        It is snapshotted when loading the top-level file and shared by all its includes.
+
+        If `loaded_files` is specified, the path of this file (if `source` is one) and of all
+        files it includes will be added to it, mapped to the modification time (in nanoseconds)
+        and size of the file when it was read and whether that file required interpolation.
+
+        `including_files` holds the paths of the files whose includes led to this one being
+        loaded, so we can report include cycles rather than recursing forever.
         """
+        if isinstance(source, Path):
+            # We stat the file outside the try below so that a missing file raises
+            # FileNotFoundError directly rather than being reported as a failure to load it.
+            source_stat = source.stat()
         try:
-            raw_yaml = yaml.safe_load(param_file_content)
-            self._validate(raw_yaml)
+            if environment is None and self.interpolate_environmental_variables:
+                environment = Parameters.from_mapping(os.environ)
+            if isinstance(source, Path):
+                (includes, loaded, needs_interpolation) = self._parse_file(
+                    source, (source_stat.st_mtime_ns, source_stat.st_size)
+                )
+                if loaded_files is not None:
+                    loaded_files[source] = (
+                        source_stat.st_mtime_ns,
+                        source_stat.st_size,
+                        needs_interpolation,
+                    )
+                including_files = including_files + (source,)
+            else:
+                (includes, loaded, needs_interpolation) = self._parse_content(source)
             previously_loaded = included_context
 
-            # process and remove special include directives
-            if "_includes" in raw_yaml:
-                for included_file in raw_yaml["_includes"]:
-                    _logger.info("Processing included parameter file %s", included_file)
-                    if not os.path.isabs(included_file):
-                        if includes_are_relative_to is not None:
-                            included_file_path = Path(
-                                includes_are_relative_to, included_file
-                            ).resolve(strict=True)
-                        else:
-                            raise ParameterError(
-                                "Cannot do relative includes when loading from"
-                                "a string."
-                            )
+            # process special include directives
+            for included_file in includes:
+                _logger.info("Processing included parameter file %s", included_file)
+                if not os.path.isabs(included_file):
+                    if includes_are_relative_to is not None:
+                        included_file_path = Path(
+                            includes_are_relative_to, included_file
+                        ).resolve(strict=True)
                     else:
-                        included_file_path = Path(included_file)
-                    previously_loaded = previously_loaded.unify(
-                        self._inner_load_from_string(
-                            included_file_path.read_text(encoding="utf-8"),
-                            error_string=str(included_file_path),
-                            includes_are_relative_to=included_file_path.parent,
-                            included_context=previously_loaded,
+                        raise ParameterError(
+                            "Cannot do relative includes when loading from a string."
                         )
+                else:
+                    included_file_path = Path(included_file)
+                if included_file_path in including_files:
+                    include_cycle = " -> ".join(
+                        str(path) for path in including_files + (included_file_path,)
                     )
-                del raw_yaml["_includes"]
-
-            interpolation_context = dict(previously_loaded.as_nested_dicts())
-            if self.interpolate_environmental_variables:
-                for k, v in os.environ.items():
-                    # environmental variables are overridden by explicit parameters
-                    if k not in interpolation_context:
-                        interpolation_context[k] = v
-
-            return previously_loaded.unify(
-                self._interpolate(
-                    Parameters.from_mapping(raw_yaml),
-                    Parameters.from_mapping(interpolation_context),
-                ),
-                namespace_prefix=namespace_path,
-            )
+                    raise ParameterError(
+                        f"Parameter files include each other: {include_cycle}"
+                    )
+                previously_loaded = previously_loaded.unify(
+                    self._inner_load(
+                        included_file_path,
+                        error_string=str(included_file_path),
+                        includes_are_relative_to=included_file_path.parent,
+                        included_context=previously_loaded,
+                        environment=environment,
+                        loaded_files=loaded_files,
+                        including_files=including_files,
+                    )
+                )
+
+            # Most parameter files contain no interpolation placeholders at all,
+            # in which case we can skip interpolation entirely.
+            # Note the parameters from the context have already been interpolated.
+            if needs_interpolation:
+                # We use the previously loaded parameters directly as the interpolation context
+                # rather than round-tripping them through nested dicts.
+                interpolation_context = previously_loaded
+                if interpolation_context.namespace_prefix:
+                    interpolation_context = Parameters._unchecked(
+                        interpolation_context._data, tuple()
+                    )
+                # Rather than merging the environmental variables into the context,
+                # we let interpolation fall back to them only when a lookup misses.
+                loaded = self._interpolate(
+                    loaded, interpolation_context, environment=environment
+                )
+
+            return previously_loaded.unify(loaded, namespace_prefix=namespace_path)
         except Exception as e:
             raise IOError(f"Failure while loading parameter file {error_string}") from e
 
+    def _read_parameters_cache(self, cache_file: Path) -> Optional[Parameters]:
+        """
+        Get the `Parameters` from *cache_file*, if it exists and is still valid.
+        """
+        try:
+            with cache_file.open("rb") as cache_in:
+                cached = pickle.load(cache_in)
+            if (
+                cached["format_version"] != _PARAMETERS_CACHE_FORMAT_VERSION
+                or cached["interpolate_environmental_variables"]
+                != self.interpolate_environmental_variables
+            ):
+                return None
+            for (loaded_file, modification_time, size) in cached["loaded_files"]:
+                loaded_file_stat = loaded_file.stat()
+                if (
+                    loaded_file_stat.st_mtime_ns != modification_time
+                    or loaded_file_stat.st_size != size
+                ):
+                    return None
+            if cached["environment_digest"] is not None and (
+                cached["environment_digest"] != _environment_digest()
+            ):
+                return None
+            return cached["parameters"]
+        except Exception:  # pylint:disable=broad-except
+            # a missing, stale, or corrupt cache just means we need to load normally
+            return None
+
+    def _write_parameters_cache(
+        self,
+        cache_file: Path,
+        params: Parameters,
+        loaded_files: Dict[Path, Tuple[int, int, bool]],
+    ) -> None:
+        """
+        Save *params*, loaded from *loaded_files*, to *cache_file*.
+        """
+        # We record the versions of the files we actually read rather than statting them again,
+        # so a file modified while we were loading invalidates the cache.
+        loaded_file_stats = [
+            (loaded_file, modification_time, size)
+            for (loaded_file, (modification_time, size, _)) in loaded_files.items()
+        ]
+        # the environment can only affect the result if some file used interpolation
+        if self.interpolate_environmental_variables and any(
+            needs_interpolation for (_, _, needs_interpolation) in loaded_files.values()
+        ):
+            environment_digest: Optional[str] = _environment_digest()
+        else:
+            environment_digest = None
+        to_cache = {
+            "format_version": _PARAMETERS_CACHE_FORMAT_VERSION,
+            "interpolate_environmental_variables": self.interpolate_environmental_variables,
+            "loaded_files": loaded_file_stats,
+            "environment_digest": environment_digest,
+            # Parameters pickle without their lazily computed caches (see __reduce__),
+            # so a process reading this cache computes its own hashes.
+            "parameters": params,
+        }
+        # We write to a temporary file and then move it into place so that concurrent readers
+        # never see a partially written cache.
+        temp_cache_file = cache_file.with_name(
+            f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with temp_cache_file.open("wb") as cache_out:
+                pickle.dump(to_cache, cache_out, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_cache_file, cache_file)
+        except Exception:  # pylint:disable=broad-except
+            _logger.warning(
+                "Could not write parameters cache %s", cache_file, exc_info=True
+            )
+            try:
+                temp_cache_file.unlink()
+            except OSError:
+                pass
+
+    def _parse_file(
+        self, path: Path, file_version: Tuple[int, int]
+    ) -> Tuple[Sequence[Any], Parameters, bool]:
+        """
+        Parse the parameter file at *path* as `_parse_content` does.
+
+        *file_version* is the modification time (in nanoseconds) and size of the file.
+        If we have already parsed the file when it had the same version,
+        we reuse that result without reading the file again.
+        """
+        cached = self._parsed_file_cache.get(path)
+        if cached is not None and cached[0] == file_version:
+            parsed = cached[1]
+        else:
+            # YAML handles any style of line endings itself,
+            # so we skip the newline translation of reading in text mode.
+            parsed = self._parse_content(path.read_bytes().decode("utf-8"))
+            self._parsed_file_cache[path] = (file_version, parsed)
+        (includes, params, needs_interpolation) = parsed
+        # Callers may modify the lists and other mutable values in the parameters we return,
+        # so each load gets its own copies of these rather than those we cached.
+        return (includes, self._copy_mutable_values(params), needs_interpolation)
+
+    @staticmethod
+    def _copy_mutable_values(params: Parameters) -> Parameters:
+        """
+        Get a `Parameters` equal to *params* with its mutable values (e.g. lists) deep-copied.
+
+        Namespaces containing only immutable values are shared rather than copied.
+        """
+        # pylint:disable=protected-access
+        copied_data: Optional[Dict[str, Any]] = None
+        for (key, val) in params._data.items():
+            if isinstance(val, Parameters):
+                copied_val = YAMLParametersLoader._copy_mutable_values(val)
+            elif type(val) in _IMMUTABLE_YAML_VALUE_TYPES:
+                continue
+            else:
+                copied_val = deepcopy(val)
+            if copied_val is not val:
+                if copied_data is None:
+                    copied_data = dict(params._data)
+                copied_data[key] = copied_val
+        if copied_data is None:
+            return params
+        return Parameters._unchecked(copied_data, params.namespace_prefix)
+
     @staticmethod
-    def _validate(raw_yaml: Mapping):
+    def _parse_content(param_file_content: str) -> Tuple[Sequence[Any], Parameters, bool]:
+        """
+        Get the files included by parameter file content, the `Parameters` for the rest of it,
+        and whether it might need interpolation.
+
+        Interpolation has not yet been performed on the returned `Parameters`.
+        """
+        (yaml, safe_loader, _) = _yaml_support()
+        raw_yaml = yaml.load(param_file_content, Loader=safe_loader)
         # we don't use check_isinstance so we can have a custom error message
         check_arg(
             isinstance(raw_yaml, Mapping),
             "Parameters YAML files must be mappings at the top level",
         )
-        YAMLParametersLoader._check_all_keys_strings(raw_yaml)
+        includes = raw_yaml.get("_includes", ())
+        # Parameters are immutable, so the result can safely be shared between loads.
+        parsed = YAMLParametersLoader._parameters_from_yaml(
+            {k: v for (k, v) in raw_yaml.items() if k != "_includes"}, tuple()
+        )
+        # Most parameter files contain no interpolation placeholders at all,
+        # which we can tell without looking at the parsed values.
+        return (includes, parsed, "%" in param_file_content)
 
     @staticmethod
-    def _check_all_keys_strings(mapping: Mapping, path=None):
-        if path is None:
-            path = []
+    def _parameters_from_yaml(
+        raw_yaml: Mapping, namespace_prefix: Tuple[str, ...]
+    ) -> Parameters:
+        """
+        Convert a mapping parsed from YAML to `Parameters`, checking its keys as we go.
 
-        non_string_keys = [x for x in mapping.keys() if not isinstance(x, str)]
+        This gives the same result as `Parameters.from_mapping`, but also checks that all keys
+        are strings (YAML allows other keys) in the same pass over the mappings.
+        """
+        non_string_keys = [
+            key
+            for key in raw_yaml
+            # the YAML loader only produces built-in strings, so we can skip
+            # the slower isinstance check in the common case
+            if type(key) is not str and not isinstance(key, str)
+        ]
         if non_string_keys:
             context_string = (
-                (" in context" + ".".join(path)) if path else " in root context"
+                f"in context {'.'.join(namespace_prefix)}"
+                if namespace_prefix
+                else "in root context"
             )
-            raise IOError("Non-string key(s) " + str(non_string_keys) + context_string)
+            raise IOError(f"Non-string key(s) {non_string_keys} {context_string}")
 
-        for val in mapping.values():
-            if isinstance(val, Mapping):
-                YAMLParametersLoader._check_all_keys_strings(val)
+        data = {
+            key: YAMLParametersLoader._parameters_from_yaml(
+                val, namespace_prefix + (key,)
+            )
+            if isinstance(val, Mapping)
+            else val
+            for (key, val) in raw_yaml.items()
+        }
+        Parameters._check_keys(data)
+        return Parameters._unchecked(data, namespace_prefix)
 
     _INTERPOLATION_REGEX = re.compile(r"%([\w.\-]+)%")
 
     # noinspection PyProtectedMember
     @staticmethod
-    def _interpolate(to_interpolate: Parameters, context: Parameters) -> Parameters:
+    def _interpolate(
+        to_interpolate: Parameters,
+        context: Parameters,
+        *,
+        environment: Optional[Parameters] = None,
+    ) -> Parameters:
         r"""
         Perform interpolation within arbitrarily nested `Parameter`\ s,
         looking up values in a context if necessary.
@@ -1567,7 +2305,8 @@ class YAMLParametersLoader:
             - greeting: "hello %name%"
         will yield a value of "hello Bob" for the parameter *greeting*.
         Parameter lookups are first performed relative to *to_interpolate*,
-        falling back to *context* on lookup failures.
+        falling back to *context* on lookup failures
+        and then to *environment*, if specified.
 
         If the entire uninterpolated string is an interpolation placeholder
         (e.g.  *foo: "%interpolate_me%"*), the parameter will be assigned
@@ -1589,87 +2328,135 @@ class YAMLParametersLoader:
             not context.namespace_prefix, "Cannot interpolate with non-top-level context"
         )
 
+        # The same parameter names are looked up repeatedly during interpolation,
+        # so we split each into its namespace components only once.
+        split_param_names: Dict[str, Tuple[str, ...]] = {}
+
+        def split_param_name(param_name: str) -> Tuple[str, ...]:
+            parts = split_param_names.get(param_name)
+            if parts is None:
+                parts = split_param_names[param_name] = tuple(param_name.split("."))
+            return parts
+
         # These will be used when we represent parameters as dicts-of-dicts below.
         def get_from_nested_dict(
             nested_dict: Dict[str, Any], param_name: str
         ) -> Optional[Any]:
-            parts = param_name.split(".")
-            cur_dict = nested_dict
-            for part in parts[:-1]:
-                if part in cur_dict:
-                    cur_dict = cur_dict[part]
+            cur_val: Any = nested_dict
+            for part in split_param_name(param_name):
+                if isinstance(cur_val, dict):
+                    cur_val = cur_val.get(part)
                 else:
                     return None
-            param_name = parts[-1]
-            return cur_dict.get(param_name, None)
+            return cur_val
 
         def set_in_nested_dict(
             nested_dict: Dict[str, Any], fully_qualified_param_name: str, value: Any
         ) -> None:
-            parts = fully_qualified_param_name.split(".")
+            parts = split_param_name(fully_qualified_param_name)
             cur_dict = nested_dict
             for part in parts[:-1]:
                 if part in cur_dict:
                     cur_dict = cur_dict[part]
                 else:
                     return None
-            param_name = parts[-1]
-            cur_dict[param_name] = value
-
-        # We make a mutable representation of the parameters we are interpolating
-        # as nested dictionaries in order to perform the actual interpolation.
-        # We will convert back to immutable Parameters objects at the end.
-        mutable_parameters = to_interpolate.as_nested_dicts()
-
-        # In order to perform arbitrary interpolation, we perform topological sort on a graph where
-        # the nodes are parameter keys, and edges point from those keys to each interpolation group
-        # in that key's value. For example, the parameter entry `foo: %bar%/projects/%meep.baz%`
-        # would give the edges (foo, bar) and (foo, meep.baz).
+            cur_dict[parts[-1]] = value
+
+        # Parameter values may themselves refer to other parameters which need interpolation,
+        # so we need to interpolate each parameter only after those it refers to.
+        # We think of this as a graph where the nodes are parameter keys, and edges point from
+        # those keys to each interpolation group in that key's value. For example, the parameter
+        # entry `foo: %bar%/projects/%meep.baz%` would give the edges (foo, bar)
+        # and (foo, meep.baz).
+        # We record this graph as the dependencies of each parameter below,
+        # but only build a `Digraph` from it to report cycles (see below).
         #
         # pylint:disable=protected-access
         # Perform the interpolation in-place.
-        nodes = list()
-        edges = list()
-
-        def gather_interpolation_edges(params: Parameters) -> None:
-            for key, val in params.namespaced_items():
-                if isinstance(val, str):
-                    for interp_match in YAMLParametersLoader._INTERPOLATION_REGEX.findall(
-                        val
-                    ):
-                        nodes.append(key)
-                        if get_from_nested_dict(mutable_parameters, interp_match):
+        # the interpolation placeholders found in each parameter's uninterpolated value,
+        # so we only need to scan each string once.
+        placeholders_by_param: Dict[str, List[str]] = {}
+        # the placeholders in each parameter's value which refer to the parameters
+        # being interpolated rather than to the context.
+        dependencies_by_param: Dict[str, List[str]] = {}
+
+        # all the parameters and namespaces we are interpolating, by their dotted names
+        to_interpolate_index = to_interpolate._flat_index()
+
+        # bound once here since they are called for many values
+        find_placeholders = YAMLParametersLoader._INTERPOLATION_REGEX.findall
+        split_on_placeholders = YAMLParametersLoader._INTERPOLATION_REGEX.split
+
+        # We walk the parameters depth-first without recursion.
+        # Each stack entry holds the dotted name prefix of a namespace
+        # and an iterator over the items in that namespace not yet visited.
+        to_scan: List[Tuple[str, Iterator[Tuple[str, Any]]]] = [
+            ("", iter(to_interpolate._data.items()))
+        ]
+        while to_scan:
+            (name_prefix, unscanned_items) = to_scan[-1]
+            for (key, val) in unscanned_items:
+                if isinstance(val, Parameters):
+                    to_scan.append((f"{name_prefix}{key}.", iter(val._data.items())))
+                    break
+                # Most values contain no placeholders, which a substring test rules out
+                # more cheaply than running the regular expression.
+                elif isinstance(val, str) and "%" in val:
+                    param_name = name_prefix + key
+                    placeholders = find_placeholders(val)
+                    if not placeholders:
+                        continue
+                    placeholders_by_param[param_name] = placeholders
+                    dependencies = dependencies_by_param[param_name] = []
+                    for interp_match in placeholders:
+                        referenced_value = to_interpolate_index.get(interp_match)
+                        if isinstance(referenced_value, Parameters):
+                            # like the nested dicts below, empty namespaces don't count
+                            referenced_value = referenced_value._data
+                        if referenced_value:
                             # We don't want to include nodes from the context in the interpolation
                             # ordering since the context is present
                             # only to be referred to by for interpolation into other parameters,
                             # not to include its parameters directly in the interpolation result.
-                            nodes.append(interp_match)
-                            edges.append((key, interp_match))
-                elif isinstance(val, Parameters):
-                    gather_interpolation_edges(val)
+                            dependencies.append(interp_match)
+            else:
+                to_scan.pop()
 
-        gather_interpolation_edges(to_interpolate)
+        if not placeholders_by_param:
+            # there is nothing to interpolate, so the parameters are unchanged
+            return to_interpolate
 
-        g = Digraph(nodes=nodes, edges=edges)
-        # Since each edge has been created to point from a key to a dependency, this is to make the
-        # ordering start from the leaves.
-        interpolation_ordering = tuple(reversed(tuple(g.topological_sort())))
+        # We make a mutable representation of the parameters we are interpolating
+        # as nested dictionaries in order to perform the actual interpolation.
+        # We will convert back to immutable Parameters objects at the end.
+        mutable_parameters = to_interpolate.as_nested_dicts()
 
-        def get_backing_off_to_context(param_name: str) -> Any:
+        def get_backing_off_to_context(param_name: str, param_to_interpolate: str) -> Any:
             from_these_params = get_from_nested_dict(mutable_parameters, param_name)
             if from_these_params:
                 return from_these_params
 
             # if the parameter is not present in the parameters we are interpolating directly,
             # we look it up in the context.
+            # Explicit parameters take priority over environmental variables.
+            from_context = context._private_get(param_name, optional=True)
+            if from_context is not None:
+                return from_context
+            if environment is not None:
+                from_environment = environment._private_get(param_name, optional=True)
+                if from_environment is not None:
+                    return from_environment
             try:
+                # this will fail, but gives the most informative error
                 return context._private_get(param_name)
             except ParameterError as e:
                 raise ParameterError(
                     f"The key '{param_to_interpolate}' doesn't exist in the parameters."
                 ) from e
 
-        for param_to_interpolate in interpolation_ordering:
+        def interpolate_param(param_to_interpolate: str) -> None:
+            placeholders = placeholders_by_param[param_to_interpolate]
+
             # first, we need to get the *uninterpolated* parameters value
             # (i.e. with %foo%s still present).
             uninterpolated_param_value = get_from_nested_dict(
@@ -1680,100 +2467,212 @@ class YAMLParametersLoader:
                 raise RuntimeError(f"This should be impossible: {param_to_interpolate}")
 
             # Next, we need to actually interpolate the values.
-            if isinstance(uninterpolated_param_value, str):
-                # We only known how to interpolate string params.
-
-                # We need to special-case when the value to be interpolated is a non-string.
-                # This allowed only when the only contents of the uninterpolated string
-                # is the interpolation placeholder.
-                # In this case, the value of the parameter is assigned to be
-                # the value of the parameter referred to by the interpolation placeholder.
-                if YAMLParametersLoader._INTERPOLATION_REGEX.fullmatch(
-                    uninterpolated_param_value
-                ):
-                    interpolated_value = get_backing_off_to_context(
-                        uninterpolated_param_value[1:-1]
+            # We need to special-case when the value to be interpolated is a non-string.
+            # This allowed only when the only contents of the uninterpolated string
+            # is the interpolation placeholder.
+            # In this case, the value of the parameter is assigned to be
+            # the value of the parameter referred to by the interpolation placeholder.
+            # Since placeholders cannot overlap, this holds exactly when
+            # the single placeholder spans the whole string.
+            if len(placeholders) == 1 and len(uninterpolated_param_value) == (
+                len(placeholders[0]) + 2
+            ):
+                interpolated_value = get_backing_off_to_context(
+                    placeholders[0], param_to_interpolate
+                )
+            else:
+                # the more usual case of interpolating a string into a string.
+                # Splitting on the placeholder pattern alternates literal text
+                # with placeholder names, so we can fill in the placeholders
+                # without creating a replacement callback for each value.
+                pieces = split_on_placeholders(uninterpolated_param_value)
+                for placeholder_index in range(1, len(pieces), 2):
+                    value_to_interpolate = get_backing_off_to_context(
+                        pieces[placeholder_index], param_to_interpolate
                     )
-                else:
-                    # the more usual case of interpolating a string into a string
-                    def replace_param(param_match: Match[str]) -> str:
-                        variable_to_interpolate = param_match.group()[1:-1]
-                        value_to_interpolate = get_backing_off_to_context(
-                            variable_to_interpolate
+                    if isinstance(value_to_interpolate, str):
+                        pieces[placeholder_index] = value_to_interpolate
+                    else:
+                        # Note we already checked for the only allowable case
+                        # for non-string interpolation on the other branch of the else.
+                        raise ParameterError(
+                            f"Can only replace an interpolation variable with a non-string "
+                            f"value if the variable is the entire non-interpolated "
+                            f"parameter value: {param_to_interpolate}"
                         )
-                        if isinstance(value_to_interpolate, str):
-                            return value_to_interpolate
-                        else:
-                            # Note we already checked for the only allowable case
-                            # for non-string interpolation on the other branch of the else.
-                            raise ParameterError(
-                                f"Can only replace an interpolation variable with a non-string "
-                                f"value if the variable is the entire non-interpolated "
-                                f"parameter value: {param_to_interpolate}"
-                            )
+                interpolated_value = "".join(pieces)
+            set_in_nested_dict(
+                mutable_parameters, param_to_interpolate, interpolated_value
+            )
 
-                    interpolated_value = re.sub(
-                        YAMLParametersLoader._INTERPOLATION_REGEX,
-                        replace_param,
-                        uninterpolated_param_value,
-                    )
-                set_in_nested_dict(
-                    mutable_parameters, param_to_interpolate, interpolated_value
+        # We repeatedly sweep over the parameters still awaiting interpolation,
+        # interpolating each one whose dependencies have all been interpolated already,
+        # until none remain.
+        # For typical parameter files this needs only a pass or two
+        # and is much cheaper than sorting the whole graph.
+        awaiting_interpolation = list(placeholders_by_param)
+        not_yet_interpolated = set(awaiting_interpolation)
+        while awaiting_interpolation:
+            still_awaiting_interpolation = []
+            for param_to_interpolate in awaiting_interpolation:
+                if any(
+                    dependency in not_yet_interpolated
+                    for dependency in dependencies_by_param[param_to_interpolate]
+                ):
+                    still_awaiting_interpolation.append(param_to_interpolate)
+                else:
+                    interpolate_param(param_to_interpolate)
+                    not_yet_interpolated.discard(param_to_interpolate)
+            if len(still_awaiting_interpolation) == len(awaiting_interpolation):
+                # No progress is possible, so the remaining parameters must form a cycle.
+                # Sorting the full graph will raise an error describing it.
+                nodes = [
+                    node
+                    for (param, dependencies) in dependencies_by_param.items()
+                    for node in (param, *dependencies)
+                ]
+                edges = [
+                    (param, dependency)
+                    for (param, dependencies) in dependencies_by_param.items()
+                    for dependency in dependencies
+                ]
+                tuple(Digraph(nodes=nodes, edges=edges).topological_sort())
+                raise RuntimeError(
+                    f"This should be impossible: {still_awaiting_interpolation}"
                 )
+            awaiting_interpolation = still_awaiting_interpolation
 
         # Re-convert from the mutable dict-of-dict-....-of-dicts format
         # we have been using back to immutable Parameters.
-        return Parameters.from_mapping(
-            immutabledict(
-                (key, mutable_parameters[key]) for key in to_interpolate._data.keys()
-            ),
-            namespace_prefix=to_interpolate.namespace_prefix,
-        )
+        # Only the namespaces containing an interpolated parameter can have changed,
+        # so we rebuild just those and reuse the rest of to_interpolate as it is.
+        changed_namespaces: Set[str] = set()
+        for param_name in placeholders_by_param:
+            parts = split_param_name(param_name)
+            for num_parts in range(1, len(parts)):
+                changed_namespaces.add(".".join(parts[:num_parts]))
+
+        def rebuild(
+            params: Parameters, interpolated: Dict[str, Any], name_prefix: str
+        ) -> Parameters:
+            # interpolated has exactly the keys of params, in the same order
+            rebuilt: Dict[str, Any] = {}
+            for (key, old_val) in params._data.items():
+                val = interpolated[key]
+                if isinstance(old_val, Parameters):
+                    if name_prefix + key in changed_namespaces:
+                        val = rebuild(old_val, val, f"{name_prefix}{key}.")
+                    else:
+                        val = old_val
+                elif isinstance(val, Mapping):
+                    # a namespace was interpolated in place of a leaf
+                    val = Parameters.from_mapping(
+                        val, namespace_prefix=_extend_prefix(params.namespace_prefix, key)
+                    )
+                rebuilt[key] = val
+            return Parameters._unchecked(rebuilt, params.namespace_prefix)
+
+        return rebuild(to_interpolate, mutable_parameters, "")
+
+
+@lru_cache(maxsize=1)
+def _yaml_support() -> Tuple[Any, Any, Any]:
+    """
+    Get the PyYAML module, the loader to parse parameter files with,
+    and the dumper to write them with.
+
+    PyYAML is only imported the first time this is called, so programs which never read
+    or write parameter files don't pay for importing it.
+    """
+    # pylint:disable=import-outside-toplevel
+    import yaml
+
+    try:
+        # the libyaml-backed loader and dumper are much faster than the pure-Python ones
+        from yaml import CSafeDumper as safe_dumper
+        from yaml import CSafeLoader as safe_loader
+    except ImportError:
+        from yaml import SafeDumper as safe_dumper  # type: ignore
+        from yaml import SafeLoader as safe_loader  # type: ignore
+
+    class ParametersDumper(safe_dumper):  # type: ignore
+        r"""
+        Ensures that objects are written to param files in certain canonical ways.
+
+        `Parameters` are written directly as mappings, so we need not first copy them
+        to nested dictionaries. `Path`\ s are written out as strings instead of as YAML objects,
+        and any other sequences and mappings are written as plain YAML lists and maps.
+
+        Only the types registered below may appear in parameter files; anything else is an error.
+        We subclass the dumper rather than registering these representers with PyYAML globally.
+        """
+
+        yaml_representers: Dict[Any, Callable] = {}
+        yaml_multi_representers: Dict[Any, Callable] = {}
+
+        def ignore_aliases(self, data: Any) -> bool:
+            # a value shared between several parameters should be written out in full
+            # each place it appears rather than as a YAML alias.
+            return True
+
+        def represent_parameters(self, params: Parameters) -> Any:
+            # pylint:disable=protected-access
+            return self.represent_mapping("tag:yaml.org,2002:map", params._data.items())
+
+        def represent_path(self, path: Path) -> Any:
+            return self.represent_str(str(path))
+
+        def represent_bytes(self, _: Any) -> Any:
+            raise RuntimeError("bytes and bytearrays are not legal parameter values")
+
+        def represent_other(self, data: Any) -> Any:
+            if isinstance(data, Mapping):
+                return self.represent_mapping("tag:yaml.org,2002:map", data.items())
+            elif isinstance(data, Sequence) and not isinstance(data, (bytes, bytearray)):
+                return self.represent_sequence("tag:yaml.org,2002:seq", data)
+            else:
+                raise RuntimeError(
+                    f"Don't know how to serialize out {data} as a parameter value"
+                )
+
+    ParametersDumper.add_representer(Parameters, ParametersDumper.represent_parameters)
+    ParametersDumper.add_representer(bool, ParametersDumper.represent_bool)
+    ParametersDumper.add_representer(list, ParametersDumper.represent_list)
+    ParametersDumper.add_representer(tuple, ParametersDumper.represent_list)
+    ParametersDumper.add_representer(dict, ParametersDumper.represent_dict)
+    ParametersDumper.add_representer(bytes, ParametersDumper.represent_bytes)
+    ParametersDumper.add_representer(bytearray, ParametersDumper.represent_bytes)
+    ParametersDumper.add_multi_representer(str, ParametersDumper.represent_str)
+    ParametersDumper.add_multi_representer(int, ParametersDumper.represent_int)
+    ParametersDumper.add_multi_representer(float, ParametersDumper.represent_float)
+    ParametersDumper.add_multi_representer(Path, ParametersDumper.represent_path)
+    ParametersDumper.add_multi_representer(None, ParametersDumper.represent_other)
+
+    return (yaml, safe_loader, ParametersDumper)
 
 
 @attrs(frozen=True)
 class YAMLParametersWriter:
     def write(self, params: Parameters, sink: Union[Path, str, CharSink]) -> None:
-        # pylint:disable=protected-access
-
         if isinstance(sink, Path) or isinstance(sink, str):
             sink = CharSink.to_file(sink)
         with sink.open() as out:
-            yaml.dump(
-                self._preprocess_dicts(params.as_nested_dicts()),
-                out,
-                # prevents leaf dictionaries from being written in the
-                # human unfriendly compact style
-                default_flow_style=False,
-                indent=4,
-                width=78,
-                sort_keys=False,
-            )
+            self._dump(params, out)
 
-    def _preprocess_dicts(self, param_node: Any) -> Any:
-        r"""
-        Ensure that objects are written to param files in certain canonical ways.
-
-        Right now this just ensures that `Path`\ s are written out as strings
-        instead of as YAML objects,
-        but it could do other things in the future.
-
-        We don't do this using pyyaml representers because there doesn't seem to be a documented way
-        to register a representer non-globally.
-        """
-        if isinstance(param_node, Path):
-            return str(param_node)
-        elif isinstance(param_node, Mapping):
-            return {k: self._preprocess_dicts(v) for (k, v) in param_node.items()}
-        elif isinstance(param_node, (str, int, float)):
-            return param_node
-        # we need to check this explicitly because otherwise
-        # they would trigger the check for sequences below
-        elif isinstance(param_node, (bytes, bytearray)):
-            raise RuntimeError("bytes and bytearrays are not legal parameter values")
-        elif isinstance(param_node, Sequence):
-            return [self._preprocess_dicts(item) for item in param_node]
-        else:
-            raise RuntimeError(
-                f"Don't know how to serialize out {param_node} as a parameter value"
-            )
+    @staticmethod
+    def _dump(params: Parameters, out: Optional[TextIO] = None) -> Optional[str]:
+        """
+        Write *params* as YAML to *out*, or return the YAML as a string if *out* is `None`.
+        """
+        (yaml, _, parameters_dumper) = _yaml_support()
+        return yaml.dump(
+            params,
+            out,
+            Dumper=parameters_dumper,
+            # prevents leaf dictionaries from being written in the
+            # human unfriendly compact style
+            default_flow_style=False,
+            indent=4,
+            width=78,
+            sort_keys=False,
+        )
@@ -65,7 +65,10 @@ def _real_parameters_only_entry_point(
 
     parsed_args = arg_parser.parse_args(args)
 
-    params = YAMLParametersLoader().load(parsed_args.param_file)
+    if parameters:
+        params = parameters
+    else:
+        params = YAMLParametersLoader().load(parsed_args.param_file)
     if parsed_args.p:
         params = params.unify(params.from_key_value_pairs(parsed_args.p))
     configure_logging_from(params)
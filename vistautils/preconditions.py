@@ -47,24 +47,32 @@ def check_state(result: Any, msg: str = None):
 
 def check_args_are_none(*args, msg: str = None):
     for arg in args:
-        check_arg(arg is None, msg)
+        if arg is not None:
+            # only call check_arg to raise its error, so passing checks cost no extra call
+            check_arg(False, msg)
 
 
 def check_args_not_none(*args, msg: str = None):
     for arg in args:
-        check_arg(arg is not None, msg)
+        if arg is None:
+            check_arg(False, msg)
 
 
 def check_isinstance(item: T, classinfo: _ClassInfo) -> T:
     if not isinstance(item, classinfo):
-        raise TypeError(
-            "Expected instance of type {!r} but got type {!r} for {!r}".format(
-                classinfo, type(item), item
-            )
-        )
+        raise _wrong_type_error(item, classinfo)
     return item
 
 
+def _wrong_type_error(item: Any, classinfo: _ClassInfo) -> TypeError:
+    # the message is only formatted once a check has failed
+    return TypeError(
+        "Expected instance of type {!r} but got type {!r} for {!r}".format(
+            classinfo, type(item), item
+        )
+    )
+
+
 def check_opt_isinstance(item: T, classinfo: _ClassInfo) -> T:
     """
     Checks something is ether None or an instance of a given class.
@@ -72,17 +80,14 @@ def check_opt_isinstance(item: T, classinfo: _ClassInfo) -> T:
     Raises a TypeError otherwise
     """
     if item and not isinstance(item, classinfo):
-        raise TypeError(
-            "Expected instance of type {!r} but got type {!r} for {!r}".format(
-                classinfo, type(item), item
-            )
-        )
+        raise _wrong_type_error(item, classinfo)
     return item
 
 
 def check_all_isinstance(items: Iterable[Any], classinfo: _ClassInfo):
     for item in items:
-        check_isinstance(item, classinfo)
+        if not isinstance(item, classinfo):
+            raise _wrong_type_error(item, classinfo)
 
 
 def check_issubclass(item, classinfo: _ClassInfo):